@@ -0,0 +1,24 @@
+r"""*Benchmark scripts for* ``tempvars``.
+
+Not part of the distributed package. Run each from the repository
+root as a module, e.g., ``python -m benchmarks.local_scope``.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
@@ -0,0 +1,87 @@
+r"""*Benchmark of local-scope* ``TempVars`` *against manual* ``del``.
+
+Times an inner loop that creates a couple of temporaries per iteration,
+cleaned up either by manual ``del``, by re-entering one local-scope
+``TempVars`` instance, or by creating a new instance per iteration.
+
+Requires Python 3.13+ (:pep:`667`). Run from the repository root as::
+
+    python -m benchmarks.local_scope
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import sys
+import timeit
+
+from tempvars import TempVars
+
+N_ITER = 1000
+
+
+def manual_del():
+    total = 0
+    for i in range(N_ITER):
+        t_a = [i] * 4
+        t_b = sum(t_a)
+        total += t_b
+        del t_a, t_b
+    return total
+
+
+def reentered():
+    total = 0
+    tv = TempVars(starts=["t_"], local=True, retain=False)
+    for i in range(N_ITER):
+        with tv:
+            t_a = [i] * 4
+            t_b = sum(t_a)
+            total += t_b
+    return total
+
+
+def per_iteration():
+    total = 0
+    for i in range(N_ITER):
+        with TempVars(starts=["t_"], local=True, retain=False):
+            t_a = [i] * 4
+            t_b = sum(t_a)
+            total += t_b
+    return total
+
+
+def main():
+    if sys.version_info < (3, 13):
+        print("Local-scope TempVars requires Python 3.13 or later.")
+        return
+
+    base = None
+    for fn in (manual_del, reentered, per_iteration):
+        best = min(timeit.repeat(fn, number=20, repeat=5)) / 20 / N_ITER
+        base = base or best
+        print(
+            "{0:15s} {1:8.3f} us/iter  ({2:5.1f}x)".format(
+                fn.__name__, best * 1e6, best / base
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
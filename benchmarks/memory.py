@@ -0,0 +1,145 @@
+r"""*Peak- and steady-state-memory benchmark for* ``tempvars``.
+
+Runs notebook-style workloads, each allocating large temporaries
+(arrays, dicts, strings), in fresh subprocesses, unscoped and under
+``TempVars`` with each retention/restore option. It reports peak RSS
+(:func:`resource.getrusage`) and the steady-state RSS after the
+workload (``/proc/self/statm``, where available).
+
+Run from the repository root as::
+
+    python -m benchmarks.memory [--scale MB]
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+# Body of each workload "cell"; SCALE is the temporary's size in MB
+WORKLOADS = {
+    "array": (
+        "from array import array\n"
+        "t_arr = array('d', bytes(SCALE * 2 ** 20))\n"
+        "result = sum(t_arr[::4096])\n"
+    ),
+    "dict": (
+        "t_d = {i: str(i) for i in range(SCALE * 2 ** 20 // 100)}\n"
+        "result = len(t_d)\n"
+    ),
+    "string": ("t_s = 'x' * (SCALE * 2 ** 20)\n" "result = len(t_s)\n"),
+}
+
+# How the workload is wrapped; None means unscoped
+MODES = {
+    "unscoped": None,
+    "default": "",
+    "no_retain": "retain=False",
+    "no_restore": "restore=False",
+    "no_retain_restore": "retain=False, restore=False",
+}
+
+# Executed in each subprocess; the result is printed as JSON
+_RUNNER = r"""
+import gc, json, os, resource, sys
+
+def rss_now():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return None
+
+def peak():
+    kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return kb if sys.platform == 'darwin' else kb * 1024
+
+ns = {{}}
+exec('from tempvars import TempVars\nt_prior = [0] * 1000\n', ns)
+gc.collect()
+base = rss_now()
+exec({code!r}, ns)
+gc.collect()
+print(json.dumps({{'base': base, 'steady': rss_now(), 'peak': peak()}}))
+"""
+
+
+def build_code(workload, mode, scale):
+    """Assemble the cell source for `workload` run in `mode`."""
+    body = WORKLOADS[workload].replace("SCALE", str(scale))
+    args = MODES[mode]
+
+    if args is None:
+        return body
+
+    sep = ", " if args else ""
+    lines = ["    " + ln for ln in body.splitlines()]
+    return "with TempVars(starts=['t_']{0}{1}) as tv:\n{2}\n".format(
+        sep, args, "\n".join(lines)
+    )
+
+
+def run_one(code):
+    """Run `code` in a fresh interpreter; return its measurements."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [os.getcwd(), env.get("PYTHONPATH", "")]
+    )
+    out = subprocess.check_output(
+        [sys.executable, "-c", _RUNNER.format(code=code)], env=env
+    )
+    return json.loads(out.decode())
+
+
+def main():
+    """Run all workloads in all modes and print a table."""
+    prs = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    prs.add_argument(
+        "--scale", type=int, default=64, help="Temporary size in MB"
+    )
+    scale = prs.parse_args().scale
+
+    mb = 2.0 ** 20
+    print(
+        "{0:8s} {1:18s} {2:>10s} {3:>12s}".format(
+            "workload", "mode", "peak MB", "steady +MB"
+        )
+    )
+
+    for workload in WORKLOADS:
+        for mode in MODES:
+            res = run_one(build_code(workload, mode, scale))
+            steady = (
+                "n/a"
+                if res["steady"] is None
+                else "{0:12.1f}".format((res["steady"] - res["base"]) / mb)
+            )
+            print(
+                "{0:8s} {1:18s} {2:10.1f} {3:>12s}".format(
+                    workload, mode, res["peak"] / mb, steady
+                )
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+r"""*Notebook-session replay benchmark for* ``tempvars``.
+
+Generates a synthetic notebook session: hundreds of cells, each
+binding a few more long-lived globals, most wrapping their work in
+``TempVars`` blocks of varying specs (some nested). The session is
+replayed with ``exec`` against a single namespace, as the test suite
+does, once as written and once with the ``with`` statements stripped.
+The difference in per-cell time is the ``TempVars`` overhead, reported
+cumulatively and per cell as the namespace grows.
+
+Run from the repository root as::
+
+    python -m benchmarks.session [--cells N] [--repeat N] [--seed N]
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    19 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import argparse
+import random
+import time
+
+# Specs for the outer block of a scoped cell; {i} is the cell number
+SPECS = [
+    "starts=['t_']",
+    "names=['tmp', 'scratch']",
+    "ends=['_tmp']",
+    "contains=['_scr_']",
+    "starts=['t_'], ends=['_tmp'], retain=False",
+    "auto=True, export=['res{i}']",
+    "rollback=True, export=['res{i}']",
+    "starts=['t_'], restore=False",
+]
+
+# Body lines run by every cell, before the results are bound
+WORK = [
+    "t_a = [0] * 200",
+    "tmp = {k: k for k in range(50)}",
+    "x_tmp = 'x' * 1000",
+    "a_scr_b = list(range(100))",
+    "scratch = t_a[:10] if 't_a' in dir() else []",
+]
+
+# Globals added by every cell, so that the namespace grows
+GROWTH = 5
+
+
+def generate(n_cells, seed):
+    """Return a |list| of (scoped source, plain source) cell pairs."""
+    rng = random.Random(seed)
+    cells = []
+
+    for i in range(n_cells):
+        body = rng.sample(WORK, 3) + ["res{0} = {0}".format(i)]
+        grow = "\n".join("g{0}_{1} = {1}".format(i, j) for j in range(GROWTH))
+
+        if rng.random() < 0.25:
+            # Unscoped cell
+            src = "\n".join(body) + "\n" + grow + "\n"
+            cells.append((src, src))
+            continue
+
+        inner = []
+        if rng.random() < 0.2:
+            # Nested block with its own prefix
+            inner = [
+                "with TempVars(starts=['u_']):",
+                "    u_x = [1] * 50",
+                "    u_y = len(u_x)",
+            ]
+
+        spec = rng.choice(SPECS).format(i=i)
+        scoped = "with TempVars({0}):\n{1}\n{2}\n".format(
+            spec, "\n".join("    " + ln for ln in body + inner), grow
+        )
+        plain = "\n".join(body + [ln.strip() for ln in inner[1:]])
+        cells.append((scoped, plain + "\n" + grow + "\n"))
+
+    return cells
+
+
+def replay(sources):
+    r"""Exec each of `sources` in turn in one namespace.
+
+    Returns |list|\ s of the time taken by each cell and of the size of
+    the namespace after it.
+
+    """
+    ns = {"__name__": "__main__"}
+    exec("from tempvars import TempVars", ns)
+    codes = [
+        compile(src, "<cell {0}>".format(i), "exec")
+        for i, src in enumerate(sources)
+    ]
+
+    times, sizes = [], []
+    for code in codes:
+        start = time.perf_counter()
+        exec(code, ns)
+        times.append(time.perf_counter() - start)
+        sizes.append(len(ns))
+
+    return times, sizes
+
+
+def main():
+    """Replay the session, scoped and plain, and print the overhead."""
+    prs = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    prs.add_argument("--cells", type=int, default=500, help="Session length")
+    prs.add_argument(
+        "--repeat", type=int, default=5, help="Replays (best is kept)"
+    )
+    prs.add_argument("--seed", type=int, default=0, help="Generator seed")
+    args = prs.parse_args()
+
+    cells = generate(args.cells, args.seed)
+    best = {}
+
+    for variant, idx in (("scoped", 0), ("plain", 1)):
+        runs = [replay([c[idx] for c in cells]) for _ in range(args.repeat)]
+        best[variant] = [min(ts) for ts in zip(*(r[0] for r in runs))]
+        if variant == "scoped":
+            sizes = runs[0][1]
+
+    overhead = [s - p for s, p in zip(best["scoped"], best["plain"])]
+    step = max(1, args.cells // 10)
+
+    print(
+        "{0} cells, {1} globals at end, best of {2}".format(
+            args.cells, sizes[-1], args.repeat
+        )
+    )
+    print(
+        "{0:>8s} {1:>10s} {2:>16s} {3:>16s}".format(
+            "cells", "globals", "us/cell (window)", "cumulative ms"
+        )
+    )
+
+    for end in range(step, args.cells + 1, step):
+        window = overhead[end - step : end]
+        print(
+            "{0:8d} {1:10d} {2:16.1f} {3:16.2f}".format(
+                end,
+                sizes[end - 1],
+                1e6 * sum(window) / len(window),
+                1e3 * sum(overhead[:end]),
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
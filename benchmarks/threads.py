@@ -0,0 +1,122 @@
+r"""*Thread-scaling benchmark for* ``tempvars``.
+
+Runs a fixed number of ``with TempVars(...)`` entries/exits, split
+evenly across 1, 2, 4, ... threads, and reports the aggregate
+throughput. Each thread either manages its own namespace (no lock
+contention) or shares a single namespace with the others. On a
+free-threaded (no-GIL) build the former should scale with the number
+of cores; with the GIL, neither does.
+
+Run from the repository root as::
+
+    python -m benchmarks.threads [--ops N] [--max-threads N]
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+from tempvars import TempVars
+
+# Non-temporary globals in each namespace, as in a typical notebook
+N_GLOBALS = 200
+
+
+def make_ns(tag):
+    """Return a namespace with some ordinary and some temporary globals."""
+    ns = {"var{0}".format(i): i for i in range(N_GLOBALS)}
+    ns.update({"t{0}_{1}".format(tag, i): i for i in range(5)})
+    return ns
+
+
+def worker(ns, tag, ops, barrier):
+    """Enter and exit a scope on `ns` `ops` times."""
+    tv = TempVars(starts=["t{0}_".format(tag)], ns=ns)
+    name = "t{0}_new".format(tag)
+    barrier.wait()
+
+    for i in range(ops):
+        with tv:
+            ns[name] = i
+
+
+def run(n_threads, ops, shared):
+    """Return the aggregate scopes/second over `n_threads` threads."""
+    per_thread = ops // n_threads
+    shared_ns = make_ns("s")
+    barrier = threading.Barrier(n_threads + 1)
+
+    threads = [
+        threading.Thread(
+            target=worker,
+            args=(
+                shared_ns if shared else make_ns(i),
+                i,
+                per_thread,
+                barrier,
+            ),
+        )
+        for i in range(n_threads)
+    ]
+    for t in threads:
+        t.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+
+    return per_thread * n_threads / (time.perf_counter() - start)
+
+
+def main():
+    """Run the benchmark at increasing thread counts and print a table."""
+    prs = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    prs.add_argument(
+        "--ops", type=int, default=20000, help="Total scopes per run"
+    )
+    prs.add_argument(
+        "--max-threads", type=int, default=8, help="Largest thread count"
+    )
+    args = prs.parse_args()
+
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("GIL enabled: {0}".format(gil))
+    print(
+        "{0:>8s} {1:>14s} {2:>14s}".format(
+            "threads", "separate ns/s", "shared ns/s"
+        )
+    )
+
+    n = 1
+    while n <= args.max_threads:
+        print(
+            "{0:8d} {1:14.0f} {2:14.0f}".format(
+                n, run(n, args.ops, False), run(n, args.ops, True)
+            )
+        )
+        n *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -226,6 +226,8 @@ rst_epilog = """
 
 .. |str| replace:: :obj:`str`
 
+.. |bytes| replace:: :obj:`bytes`
+
 .. |unicode| replace:: :obj:`unicode`
 
 .. |bool| replace:: :obj:`bool`
@@ -25,8 +25,9 @@ Jupyter Notebook, IPython, etc.
 
 from __future__ import absolute_import
 
-__all__ = ["TempVars"]
+__all__ = ["TempVars", "load_ipython_extension", "unload_ipython_extension"]
 
 from .tempvars import TempVars
+from .ipython import load_ipython_extension, unload_ipython_extension
 
 __version__ = "1.0.1"
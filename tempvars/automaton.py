@@ -0,0 +1,149 @@
+r"""*Compiled name-matching automata for* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import re
+from collections import deque
+from functools import lru_cache
+
+# Numbered backreferences (\1) and conditionals ((?(1)...)), whose
+# group numbers would change once patterns are merged. Any escaped
+# backslashes before the digit are skipped over.
+_NUMBERED_REF = re.compile(r"(?<!\\)(?:\\\\)*\\[1-9]|\(\?\(\d")
+
+
+class AhoCorasick(object):
+    """Deterministic automaton matching any of a set of substrings.
+
+    The trie of `patterns` is completed with its failure links into a
+    full transition table when built, so :meth:`matches` costs one
+    |dict| lookup per character of the text, independent of the number
+    of patterns.
+
+    """
+
+    __slots__ = ("_delta", "_out")
+
+    def __init__(self, patterns):
+        """Build the automaton for the |str| items of `patterns`."""
+        goto = [{}]
+        out = [False]
+
+        # Trie
+        for pat in patterns:
+            state = 0
+            for ch in pat:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(False)
+                state = nxt
+            out[state] = True
+
+        # Breadth-first completion of the transitions along failure links.
+        # Characters absent from a state's table lead back to the root.
+        delta = [dict(g) for g in goto]
+        queue = deque()
+
+        for nxt in goto[0].values():
+            queue.append((nxt, 0))
+
+        while queue:
+            state, fail = queue.popleft()
+            out[state] = out[state] or out[fail]
+
+            for ch, nxt in goto[state].items():
+                queue.append((nxt, delta[fail].get(ch, 0)))
+
+            for ch, nxt in delta[fail].items():
+                delta[state].setdefault(ch, nxt)
+
+        self._delta = delta
+        self._out = out
+
+    def matches(self, text):
+        """Indicate whether any of the patterns occurs in `text`."""
+        delta, out = self._delta, self._out
+
+        if out[0]:
+            return True
+
+        state = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                return True
+
+        return False
+
+
+@lru_cache(maxsize=64)
+def automaton(patterns):
+    """Return a (cached) :class:`AhoCorasick` for the |tuple| `patterns`."""
+    return AhoCorasick(patterns)
+
+
+def has_numbered_ref(pattern):
+    """Indicate whether the regex `pattern` refers to a group by number.
+
+    Such references cannot be merged by :func:`merged_regex`, which
+    renumbers the groups of all but the first pattern.
+
+    """
+    return _NUMBERED_REF.search(pattern) is not None
+
+
+@lru_cache(maxsize=64)
+def merged_regex(regexes, globs):
+    """Return one (cached) compiled regex matching any of the patterns.
+
+    The |tuple| `regexes` of regular expressions and the |tuple| `globs`
+    of shell-style wildcard patterns (translated with
+    :func:`fnmatch.translate`) are merged into a single alternation, so
+    that testing a name against all of them takes one
+    :meth:`~re.Pattern.fullmatch` call.
+
+    Raises :exc:`ValueError` if any of `regexes` refers to a group by
+    number (see :func:`has_numbered_ref`); named groups and references
+    are unaffected by the merge.
+
+    """
+    import fnmatch
+
+    for p in regexes:
+        if has_numbered_ref(p):
+            raise ValueError(
+                "Numbered group reference in regex {0!r}; use named "
+                "groups instead".format(p)
+            )
+
+    parts = list(regexes) + [fnmatch.translate(g) for g in globs]
+    return re.compile("|".join("(?:{0})".format(p) for p in parts))
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
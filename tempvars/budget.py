@@ -0,0 +1,324 @@
+r"""*Process memory budget enforcement for* ``tempvars`` *scopes*.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+While a suite runs, a :class:`BudgetGuard` polls the resident set size
+of the process (``/proc/self/statm``; Linux only) on a background
+thread. Whenever it exceeds the budget, the largest values matching the
+|TempVars| spec are spilled to disk, from the namespace as well as from
+the masked values in ``tv.stored_nsvars``, until the budget is met
+again. If spilling cannot meet it, or if so configured, a
+:exc:`MemoryBudgetExceeded` is instead raised in the thread running the
+suite.
+
+Spilled masked values are loaded back transparently on restore; spilled
+temporaries can be recovered from ``tv.spilled``.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    19 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import ctypes
+import os
+import threading
+from collections.abc import Mapping
+
+import attr
+
+from .compression import LazyValue
+from .sizing import approx_size
+
+#: |list| of the actions available upon exceeding the budget
+ACTIONS = ["spill", "raise"]
+
+_MISSING = object()
+
+
+class MemoryBudgetExceeded(MemoryError):
+    """Raised in a suite whose process exceeds its RSS budget."""
+
+
+def rss():
+    """Return the resident set size of the process in bytes, or |None|.
+
+    |None| is returned where ``/proc/self/statm`` is unavailable.
+
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class SpillStore(Mapping):
+    """Mapping of spilled variable names to their (lazily loaded) values.
+
+    Each spilled value is saved under a label of its own in a
+    :class:`~tempvars.persist.DiskStore` in a temporary directory, which
+    is removed when the store is garbage-collected.
+
+    """
+
+    def __init__(self):
+        """Create the store; its directory is created on first use.
+
+        Raises :exc:`RuntimeError` before Python 3.8, as values are saved
+        with pickle protocol 5.
+
+        """
+        import pickle
+
+        if pickle.HIGHEST_PROTOCOL < 5:
+            raise RuntimeError("Spilling requires Python 3.8 or later")
+
+        self._dir = None
+        self._labels = {}
+        self._count = 0
+
+    def spill(self, name, value):
+        """Write `value` to disk under `name`; return |True| on success."""
+        import tempfile
+
+        from .persist import DiskStore
+
+        if self._dir is None:
+            self._dir = tempfile.TemporaryDirectory(prefix="tempvars-spill-")
+
+        label = "s{0}".format(self._count)
+        self._count += 1
+        if not DiskStore(self._dir.name).save(label, {name: value}):
+            return False
+
+        self._labels[name] = label
+        return True
+
+    def discard(self, name):
+        """Forget, and delete from disk, the value spilled under `name`."""
+        from .persist import DiskStore
+
+        label = self._labels.pop(name, None)
+        if label is not None:
+            DiskStore(self._dir.name).delete(label)
+
+    def __getitem__(self, name):
+        """Load and return the value spilled under `name`."""
+        from .persist import DiskStore
+
+        return DiskStore(self._dir.name).load(self._labels[name])[name]
+
+    def __iter__(self):
+        """Iterate over the spilled names."""
+        return iter(self._labels)
+
+    def __len__(self):
+        """Return the number of spilled values."""
+        return len(self._labels)
+
+
+class SpilledValue(LazyValue):
+    """Stand-in for a masked value spilled to a :class:`SpillStore`."""
+
+    __slots__ = ("_store", "_name")
+
+    def __init__(self, store, name):
+        """Stand in for the value spilled to `store` under `name`."""
+        self._store = store
+        self._name = name
+
+    def inflate(self):
+        """Load the spilled value back from disk."""
+        return self._store[self._name]
+
+
+@attr.s(slots=True)
+class BudgetGuard(object):
+    """Enforce an RSS budget on the process while a scope is active."""
+
+    #: |TempVars| instance whose spec selects the values to spill.
+    tempvars = attr.ib()
+
+    #: |int| budget for the process's resident set size, in bytes.
+    max_rss = attr.ib(validator=attr.validators.instance_of(int))
+
+    #: |str| action upon exceeding the budget, one of :data:`ACTIONS`.
+    action = attr.ib(default="spill", validator=attr.validators.in_(ACTIONS))
+
+    #: |float| seconds between checks of the RSS.
+    interval = attr.ib(default=0.05)
+
+    #: :class:`SpillStore` of the values spilled so far, or |None| if
+    #: `action` is ``'raise'``.
+    spilled = attr.ib(init=False)
+
+    @spilled.default
+    def _spilled_default(self):
+        return SpillStore() if self.action == "spill" else None
+
+    #: |bool| flag indicating whether :exc:`MemoryBudgetExceeded` has been
+    #: raised in the guarded thread.
+    tripped = attr.ib(init=False, default=False)
+
+    #: :exc:`MemoryBudgetExceeded` raised when the budget was last
+    #: exceeded, or |None|. Only the bare class can be raised
+    #: asynchronously in the guarded thread, so the full exception, with
+    #: its message, is kept here.
+    error = attr.ib(init=False, repr=False, default=None)
+
+    _target = attr.ib(init=False, repr=False, default=None)
+    _queued = attr.ib(init=False, repr=False, default=False)
+    _stop = attr.ib(
+        init=False, repr=False, default=attr.Factory(threading.Event)
+    )
+    _thread = attr.ib(init=False, repr=False, default=None)
+
+    def _candidates(self):
+        """Return (size, name, source) for the spillable values, largest first.
+
+        `source` is |True| for namespace variables, |False| for masked ones.
+
+        """
+        tv = self.tempvars
+        ns = tv._ns
+        keep = frozenset(tv.export or ())
+        found = []
+
+        for key, val in list(ns.items()):
+            if key not in keep and val is not None and tv._matches(key, val):
+                found.append((approx_size(val), key, True))
+
+        for key, val in list(dict.items(tv.stored_nsvars)):
+            if not isinstance(val, LazyValue):
+                found.append((approx_size(val), key, False))
+
+        found.sort(key=lambda c: c[0], reverse=True)
+        return found
+
+    def check(self):
+        """Check the RSS once, and act if it exceeds the budget.
+
+        Returns |True| if the budget was exceeded.
+
+        """
+        cur = rss()
+        if cur is None or cur <= self.max_rss or self.tripped:
+            return False
+
+        if self.action == "spill":
+            tv = self.tempvars
+
+            with tv._lock:
+                for _, key, in_ns in self._candidates():
+                    if in_ns:
+                        val = tv._ns.get(key, _MISSING)
+                        if val is _MISSING or not self.spilled.spill(key, val):
+                            continue
+
+                        # The suite runs concurrently, and may have
+                        # rebound or deleted `key` since it was read
+                        cur_val = tv._ns.pop(key, _MISSING)
+                        if cur_val is not val:
+                            if cur_val is not _MISSING:
+                                tv._ns[key] = cur_val
+                            self.spilled.discard(key)
+                            del cur_val
+                            continue
+                        del cur_val
+                    else:
+                        val = dict.get(tv.stored_nsvars, key, _MISSING)
+                        if val is _MISSING or not self.spilled.spill(key, val):
+                            continue
+                        dict.__setitem__(
+                            tv.stored_nsvars,
+                            key,
+                            SpilledValue(self.spilled, key),
+                        )
+
+                    del val
+                    cur = rss()
+                    if cur is None or cur <= self.max_rss:
+                        return True
+
+        self._raise(cur)
+        return True
+
+    def _raise(self, cur):
+        self.tripped = True
+        self.error = MemoryBudgetExceeded(
+            "Process RSS of {0} bytes exceeds the TempVars budget of {1} "
+            "bytes".format(cur, self.max_rss)
+        )
+
+        if self._target is None or self._target == threading.get_ident():
+            raise self.error
+
+        if not self._stop.is_set():
+            # Delivered at the target thread's next bytecode boundary;
+            # cancelled by stop() if still pending then
+            self._queued = True
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                ctypes.c_ulong(self._target),
+                ctypes.py_object(MemoryBudgetExceeded),
+            )
+
+    def start(self):
+        """Start monitoring on behalf of the calling thread."""
+        self._target = threading.get_ident()
+        self.tripped = False
+        self.error = None
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="tempvars-budget", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        """Stop monitoring, waiting for the monitor thread to finish.
+
+        Any :exc:`MemoryBudgetExceeded` queued for, but not yet delivered
+        to, the guarded thread is cancelled, so that it cannot interrupt
+        the steps following the suite.
+
+        """
+        self._stop.set()
+
+        try:
+            if self._thread is not None:
+                self._thread.join()
+        finally:
+            self._thread = None
+
+            # Once the thread is joined nothing more can be queued
+            if self._queued:
+                self._queued = False
+                ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                    ctypes.c_ulong(self._target), None
+                )
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+            if self.tripped:
+                return
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
@@ -0,0 +1,222 @@
+r"""*Namespace memory census for* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+Reports the largest globals of a bloated namespace, and which of them a
+|TempVars| spec would (or would not) catch, to show which variables to
+bring under scoping::
+
+    >>> census = Census(TempVars(starts=['t_'], ns=globals()))
+    >>> for name, size, caught in census.sample()['largest']:
+    ...     print(name, size, caught)
+
+Sizes are estimated one level deep (see :func:`estimate`), and cached
+by object identity between samples, so repeated samples only measure
+new or changed objects.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    19 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import threading
+import time
+import weakref
+from itertools import islice
+
+import attr
+
+from .sizing import approx_size
+from .tempvars import TempVars
+
+# Containers whose immediate contents are counted by estimate()
+_CONTAINERS = (list, tuple, set, frozenset, dict)
+
+
+def estimate(obj, max_items=1000):
+    """Estimate the memory held by `obj` and its immediate contents.
+
+    For the builtin containers, adds the
+    :func:`~tempvars.sizing.approx_size` of each item (and key) to that
+    of the container, extrapolating from the first `max_items` items of
+    larger containers. Anything deeper is not walked; other objects are
+    sized by :func:`~tempvars.sizing.approx_size` alone.
+
+    The items are copied out before being sized, so that `obj` may be
+    mutated by other threads meanwhile; if it changes size while being
+    copied, only the container itself is counted.
+
+    """
+    size = approx_size(obj)
+
+    if not isinstance(obj, _CONTAINERS) or not obj:
+        return size
+
+    try:
+        items = list(
+            islice(obj.items() if isinstance(obj, dict) else obj, max_items)
+        )
+    except RuntimeError:
+        # Changed size during iteration
+        return size
+
+    if not items:
+        return size
+
+    if isinstance(obj, dict):
+        sub = sum(approx_size(k) + approx_size(v) for k, v in items)
+    else:
+        sub = sum(map(approx_size, items))
+
+    return size + sub * max(len(obj), len(items)) // len(items)
+
+
+@attr.s(slots=True)
+class Census(object):
+    """Sample the largest objects of a namespace against a spec."""
+
+    #: |TempVars| instance providing the spec and, via its `ns`
+    #: argument, the namespace to sample.
+    tempvars = attr.ib(validator=attr.validators.instance_of(TempVars))
+
+    #: |int| number of largest variables to report.
+    top = attr.ib(default=20, validator=attr.validators.instance_of(int))
+
+    #: |dict| result of the most recent :meth:`sample`, or |None|.
+    last = attr.ib(init=False, default=None)
+
+    # Size estimates keyed by id(); each entry also holds what is needed
+    # to tell whether the id still refers to the same, unchanged object
+    _cache = attr.ib(init=False, repr=False, default=attr.Factory(dict))
+    _stop = attr.ib(
+        init=False, repr=False, default=attr.Factory(threading.Event)
+    )
+    _thread = attr.ib(init=False, repr=False, default=None)
+
+    def __attrs_post_init__(self):
+        """Compile the spec patterns once, for reuse on every sample."""
+        self.tempvars._compile_patterns()
+
+    def _size(self, obj):
+        """Return the (cached) size estimate of `obj`."""
+        n = len(obj) if isinstance(obj, _CONTAINERS) else None
+        entry = self._cache.get(id(obj))
+
+        if entry is not None:
+            ref, tp, length, size = entry
+            same = ref() is obj if ref is not None else type(obj) is tp
+            if same and length == n:
+                return size
+
+        size = estimate(obj)
+
+        try:
+            ref = weakref.ref(obj)
+        except TypeError:
+            ref = None
+
+        self._cache[id(obj)] = (ref, type(obj), n, size)
+        return size
+
+    def sample(self):
+        """Size the namespace's variables; return and keep the results.
+
+        Returns a |dict| with:
+
+        ``'largest'``
+            |list| of (name, estimated size, caught) |tuple|\\ s for the
+            `top` largest variables, largest first; `caught` indicates
+            whether the spec matches the variable (by name or value).
+        ``'caught_bytes'``, ``'uncaught_bytes'``
+            |int| total estimated sizes of all the (non-dunder) variables
+            the spec does and does not match.
+        ``'time'``
+            |float| seconds taken by the sample.
+
+        """
+        start = time.perf_counter()
+        tv = self.tempvars
+        keep = frozenset(tv.export or ())
+        rows = []
+        caught_bytes = uncaught_bytes = 0
+        live = set()
+
+        for key, val in list(tv._ns.items()):
+            if key.startswith("__") and key.endswith("__"):
+                continue
+
+            size = self._size(val)
+            live.add(id(val))
+            caught = key not in keep and tv._matches(key, val)
+
+            if caught:
+                caught_bytes += size
+            else:
+                uncaught_bytes += size
+
+            rows.append((key, size, caught))
+
+        # Forget objects no longer bound in the namespace
+        for k in [k for k in self._cache if k not in live]:
+            del self._cache[k]
+
+        rows.sort(key=lambda r: r[1], reverse=True)
+        self.last = {
+            "largest": rows[: self.top],
+            "caught_bytes": caught_bytes,
+            "uncaught_bytes": uncaught_bytes,
+            "time": time.perf_counter() - start,
+        }
+        return self.last
+
+    def start(self, interval=60.0):
+        """Sample every `interval` seconds on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Census is already running")
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(interval,),
+            name="tempvars-census",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the background thread, waiting up to `timeout` seconds."""
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self, interval):
+        while not self._stop.wait(interval):
+            try:
+                self.sample()
+            except RuntimeError:
+                # The namespace or one of its containers was mutated
+                # mid-sample; try again on the next tick
+                continue
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
@@ -0,0 +1,232 @@
+r"""*In-memory compression of masked variables in* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+Requires Python 3.8+ (pickle protocol 5).
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import abc
+import pickle
+import time
+
+import attr
+
+#: |list| of the supported compression methods
+METHODS = ["zlib", "lzma"]
+
+
+def _codec(method, level):
+    """Return the (compress, decompress) pair for `method`."""
+    if method == "zlib":
+        import zlib
+
+        lvl = zlib.Z_DEFAULT_COMPRESSION if level is None else level
+        return (lambda b: zlib.compress(b, lvl)), zlib.decompress
+
+    import lzma
+
+    return (lambda b: lzma.compress(b, preset=level)), lzma.decompress
+
+
+class LazyValue(abc.ABC):
+    """Stand-in for a masked value held elsewhere than in memory as-is.
+
+    :class:`StoredVars` replaces each stand-in by the result of its
+    :meth:`inflate` on first access. Subclasses must implement
+    :meth:`inflate`.
+
+    """
+
+    __slots__ = ()
+
+    @abc.abstractmethod
+    def inflate(self):
+        """Return the value stood in for."""
+
+
+@attr.s(slots=True)
+class CompressedValue(LazyValue):
+    """Compressed pickle of a masked value.
+
+    The pickle is made with protocol 5, so that large contiguous buffers
+    (e.g., NumPy array data) are compressed directly, out of band,
+    rather than being copied into the pickle stream first.
+
+    """
+
+    #: |str| compression method, one of :data:`METHODS`
+    method = attr.ib()
+
+    #: |bytes| compressed pickle stream
+    payload = attr.ib(repr=False)
+
+    #: |list| of |bytes|, the compressed out-of-band buffers
+    buffers = attr.ib(repr=False)
+
+    #: |int| estimated size of the value before compression
+    raw_size = attr.ib()
+
+    @property
+    def stored_size(self):
+        """|int| total size of the compressed data."""
+        return len(self.payload) + sum(map(len, self.buffers))
+
+    def inflate(self):
+        """Decompress and unpickle the stored value."""
+        _, decomp = _codec(self.method, None)
+
+        # bytearray so that array data comes back writeable
+        bufs = [bytearray(decomp(b)) for b in self.buffers]
+        return pickle.loads(decomp(self.payload), buffers=bufs)
+
+
+def compress_value(value, method, level=None, raw_size=0):
+    """Compress `value` into a :class:`CompressedValue`.
+
+    Returns |None| if `value` cannot be pickled, or if compression
+    does not actually make it smaller.
+
+    """
+    comp, _ = _codec(method, level)
+    raw = []
+
+    try:
+        data = pickle.dumps(value, protocol=5, buffer_callback=raw.append)
+    except Exception:
+        return None
+
+    cv = CompressedValue(
+        method=method,
+        payload=comp(data),
+        buffers=[comp(b.raw()) for b in raw],
+        raw_size=max(raw_size, len(data) + sum(b.raw().nbytes for b in raw)),
+    )
+
+    return cv if cv.stored_size < cv.raw_size else None
+
+
+class StoredVars(dict):
+    """|dict| of masked variables that may hold compressed values.
+
+    Compressed (or otherwise :class:`LazyValue`) values are inflated
+    transparently, and replaced by the
+    inflated value, on first access through indexing, :meth:`get`,
+    :meth:`pop`, :meth:`values` or :meth:`items`. Time spent inflating
+    is accumulated in ``stats['decompress_time']``.
+
+    """
+
+    __slots__ = ("stats",)
+
+    def __init__(self, *args, **kwargs):
+        """Create the |dict|, with empty statistics."""
+        super(StoredVars, self).__init__(*args, **kwargs)
+        self.stats = {}
+
+    def _inflate(self, key, val):
+        if not isinstance(val, LazyValue):
+            return val
+
+        start = time.perf_counter()
+        val = val.inflate()
+        self.stats["decompress_time"] = (
+            self.stats.get("decompress_time", 0.0)
+            + time.perf_counter()
+            - start
+        )
+
+        dict.__setitem__(self, key, val)
+        return val
+
+    def __getitem__(self, key):
+        """Return the (inflated) value for `key`."""
+        return self._inflate(key, dict.__getitem__(self, key))
+
+    def get(self, key, default=None):
+        """Return the (inflated) value for `key` if present, else `default`."""
+        if key in self:
+            return self[key]
+        return default
+
+    def pop(self, key, *args):
+        """Remove `key` and return its (inflated) value."""
+        return self._inflate(key, dict.pop(self, key, *args))
+
+    def values(self):
+        """Return a |list| of all the (inflated) values."""
+        return [self[k] for k in self]
+
+    def items(self):
+        """Return a |list| of all (key, inflated value) pairs."""
+        return [(k, self[k]) for k in self]
+
+    def inflate_all(self):
+        """Inflate any values still compressed."""
+        for k in self:
+            self._inflate(k, dict.__getitem__(self, k))
+
+    def compress_large(self, method, level, threshold):
+        """Compress, in place, all values estimated at `threshold` or more.
+
+        Only values referenced by nothing but this |dict| are compressed:
+        compressing an aliased value would save no memory, and would
+        detach the alias from the value later restored, which is a copy.
+
+        Time spent and sizes before and after compression are accumulated
+        in :attr:`stats`.
+
+        """
+        import sys
+
+        from .sizing import approx_size
+
+        start = time.perf_counter()
+        raw_total = stored_total = 0
+
+        for key in list(self):
+            val = dict.__getitem__(self, key)
+            size = approx_size(val)
+            if size < threshold or isinstance(val, LazyValue):
+                continue
+
+            # This dict, `val` and the getrefcount() argument
+            if sys.getrefcount(val) > 3:
+                continue
+
+            cv = compress_value(val, method, level, raw_size=size)
+            if cv is not None:
+                dict.__setitem__(self, key, cv)
+                raw_total += cv.raw_size
+                stored_total += cv.stored_size
+
+        for k, v in (
+            ("compress_time", time.perf_counter() - start),
+            ("raw_bytes", raw_total),
+            ("stored_bytes", stored_total),
+        ):
+            self.stats[k] = self.stats.get(k, 0) + v
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
@@ -0,0 +1,155 @@
+r"""*Cyclic-GC pause control around* ``tempvars`` *scopes*.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+With a huge global namespace, every full cyclic garbage collection
+traverses all of its long-lived objects. Upon entry, a :class:`GCGuard`
+moves every object then tracked by the collector into the permanent
+generation (:func:`gc.freeze`), so that collections during the suite,
+and the one run upon exit to free the suite's discarded temporaries,
+only traverse the objects created within the suite. Generation
+thresholds can also be raised for the duration of the suite.
+
+:func:`gc.freeze` and the thresholds are process-wide: with nested or
+concurrent guarded scopes, they are applied by the outermost entry and
+undone by the matching exit.
+
+Requires Python 3.7+.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    19 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import gc
+import threading
+import time
+
+import attr
+
+# Number of guarded scopes currently entered, and the thresholds to
+# restore when the last one exits
+_depth = [0, None]
+_depth_lock = threading.Lock()
+
+
+@attr.s(slots=True)
+class GCGuard(object):
+    """Freeze long-lived objects for the duration of a scope.
+
+    Statistics of the last use are kept in :attr:`stats`.
+
+    """
+
+    #: |tuple| of |int| generation thresholds (as for
+    #: :func:`gc.set_threshold`) to apply during the scope, or |None| to
+    #: leave them unchanged.
+    threshold = attr.ib(default=None)
+
+    @threshold.validator
+    def _threshold_validator(self, at, val):
+        if val is None:
+            return
+
+        if type(val) != tuple or not all(type(v) == int for v in val):
+            raise TypeError("'{0}' must be a tuple of int".format(at.name))
+
+    #: |dict| of statistics of the last scope:
+    #:
+    #: ``'frozen'``
+    #:     |int| objects excluded from collection during the scope.
+    #: ``'collections'``
+    #:     |int| collections run during the scope, including the
+    #:     one upon exit.
+    #: ``'collected'``
+    #:     |int| unreachable objects found by those collections.
+    #: ``'pause_time'``
+    #:     |float| seconds spent in those collections.
+    #: ``'saved_time'``
+    #:     |float| *estimate* of the collection time avoided by freezing,
+    #:     assuming collection time proportional to the number of objects
+    #:     traversed.
+    stats = attr.ib(init=False, default=attr.Factory(dict))
+
+    _start = attr.ib(init=False, repr=False, default=None)
+
+    def _callback(self, phase, info):
+        if phase == "start":
+            self._start = time.perf_counter()
+            return
+
+        if self._start is None:
+            return
+
+        self.stats["pause_time"] += time.perf_counter() - self._start
+        self.stats["collections"] += 1
+        self.stats["collected"] += info["collected"]
+        self._start = None
+
+    def enter(self):
+        """Freeze the currently tracked objects and apply `threshold`."""
+        with _depth_lock:
+            if _depth[0] == 0:
+                gc.freeze()
+                if self.threshold is not None:
+                    _depth[1] = gc.get_threshold()
+                    gc.set_threshold(*self.threshold)
+            _depth[0] += 1
+
+        self.stats = {
+            "frozen": gc.get_freeze_count(),
+            "collections": 0,
+            "collected": 0,
+            "pause_time": 0.0,
+            "saved_time": 0.0,
+        }
+        gc.callbacks.append(self._callback)
+
+    def exit(self):
+        """Collect the unfrozen objects, then undo :meth:`enter`.
+
+        Should be called once the scope's discarded values have been
+        dereferenced, so that any reference cycles among them are freed
+        by the collection.
+
+        """
+        scanned = len(gc.get_objects())
+        gc.collect()
+
+        try:
+            gc.callbacks.remove(self._callback)
+        except ValueError:  # pragma: no cover
+            pass
+
+        self.stats["saved_time"] = (
+            self.stats["pause_time"] * self.stats["frozen"] / max(scanned, 1)
+        )
+
+        with _depth_lock:
+            _depth[0] -= 1
+            if _depth[0] == 0:
+                gc.unfreeze()
+                if _depth[1] is not None:
+                    gc.set_threshold(*_depth[1])
+                    _depth[1] = None
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
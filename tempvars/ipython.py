@@ -0,0 +1,346 @@
+r"""*IPython extension for per-cell temporary cleanup in* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+Load with ``%load_ext tempvars`` and register a masking spec once
+with the ``%autotemp`` line magic, whose argument is evaluated as the
+keyword arguments to |TempVars|::
+
+    In [1]: %load_ext tempvars
+
+    In [2]: %autotemp starts=['t_']
+
+Thereafter, any matching global bound by a cell is discarded from
+the namespace as soon as that cell finishes. Calling ``%autotemp``
+with no arguments turns the cleanup off again.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import ast
+import sys
+
+import attr
+
+from .tempvars import TempVars
+
+# Magics that run their argument (line) or body (cell) as Python code in
+# the user namespace
+_CODE_MAGICS = frozenset(("time", "timeit", "prun", "capture"))
+
+
+def _str_value(node):
+    """Return the value of `node` if a string literal, else |None|."""
+    kind = type(node).__name__
+
+    if kind == "Constant":
+        val = node.value
+    elif kind == "Str":  # Python < 3.8
+        val = node.s
+    else:
+        return None
+
+    return val if isinstance(val, str) else None
+
+
+def _magic_names(call):
+    """Collect the names bound by code run through a magic `call`.
+
+    `call` is an :class:`ast.Call` node; only IPython's transformed
+    magic calls, ``get_ipython().run_line_magic('time', 'x = 1')`` and
+    ``get_ipython().run_cell_magic('time', '', 'x = 1')``, for one of
+    the code-running magics, yield any names.
+
+    """
+    func = call.func
+    if not (
+        isinstance(func, ast.Attribute)
+        and func.attr in ("run_line_magic", "run_cell_magic")
+    ):
+        return set()
+
+    vals = [_str_value(a) for a in call.args]
+    if len(vals) < 2 or None in vals:
+        return set()
+
+    magic, args = vals[0], vals[1:]
+    if magic not in _CODE_MAGICS:
+        return set()
+
+    names = set()
+    for arg in args:
+        names.update(assigned_names(arg))
+
+    # %%capture binds its output to the name given on the magic line
+    if magic == "capture" and len(args) > 1:
+        words = args[0].split()
+        if words and words[-1].isidentifier():
+            names.add(words[-1])
+
+    return names
+
+
+def assigned_names(source):
+    """Collect the names that `source` may bind or unbind.
+
+    Only the syntax of `source` is examined, so the cost scales with the
+    size of the cell rather than that of the namespace. The result is
+    deliberately generous (names bound in nested function or
+    comprehension scopes are included), since extra candidates are just
+    checked against the namespace and the spec.
+
+    In IPython-transformed source, the code run by the ``%time``,
+    ``%timeit``, ``%prun`` and ``%%capture`` magics (line or cell) is
+    also examined, unless options precede a line magic's code. Other
+    bindings made dynamically (:func:`exec`, ``globals()[...] = ...``,
+    other magics, etc.) are not seen.
+
+    Returns an empty |set| if `source` does not parse.
+
+    """
+    try:
+        tree = ast.parse(source)
+    except SyntaxError:
+        return set()
+
+    names = set()
+
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            if not isinstance(node.ctx, ast.Load):
+                names.add(node.id)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            names.update(
+                a.asname or a.name.partition(".")[0] for a in node.names
+            )
+        elif isinstance(
+            node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+        ):
+            names.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+        elif isinstance(node, ast.ExceptHandler):
+            if node.name:
+                names.add(node.name)
+        elif isinstance(node, ast.Call):
+            names.update(_magic_names(node))
+        elif type(node).__name__.startswith("Match"):
+            # Pattern-matching captures (Python 3.10+)
+            for at in ("name", "rest"):
+                val = getattr(node, at, None)
+                if isinstance(val, str):
+                    names.add(val)
+
+    return names
+
+
+# Singletons that may legitimately be shared with any output
+_SINGLETON_IDS = frozenset(
+    map(id, (None, True, False, Ellipsis, NotImplemented))
+)
+
+# Small immutable values, which the interpreter may cache, intern or
+# share as code constants, so that their identity says nothing
+_NUMBERS = (int, float, complex)
+_ATOM_MAX_SIZE = 64
+_ATOM_MAX_LEN = 64
+
+
+def _is_atom(obj):
+    """Indicate whether `obj` may be a cached or interned immutable value.
+
+    That is: a small number; an empty or single-character |str| or
+    |bytes|; a short identifier-like |str| (as interned by the
+    compiler); or a |tuple| of these.
+
+    """
+    if isinstance(obj, _NUMBERS):
+        return sys.getsizeof(obj) <= _ATOM_MAX_SIZE
+
+    if isinstance(obj, (str, bytes)):
+        if len(obj) <= 1:
+            return True
+        return (
+            isinstance(obj, str)
+            and len(obj) <= _ATOM_MAX_LEN
+            and obj.isidentifier()
+        )
+
+    return type(obj) is tuple and all(_is_atom(o) for o in obj)
+
+
+def purge_output_cache(ns, objs):
+    r"""Drop IPython output-history references to any of `objs`.
+
+    Entries of the ``Out`` dict in `ns`, the matching ``_N`` variables,
+    and ``_``/``__``/``___`` (in `ns` and on the shell's display hook)
+    that are *identical* to one of `objs` are evicted, so that these
+    caches do not keep the objects alive. ``_``/``__``/``___`` are reset
+    to ``''``, as IPython itself does when flushing its output cache.
+
+    Small immutable values (numbers, one-character and identifier-like
+    strings, and |tuple|\ s of them) are never purged: the interpreter
+    caches and interns such values, so an identical output need not
+    derive from the discarded variable at all. Larger strings and bytes
+    are purged as usual.
+
+    The identities of `objs` are indexed once up front, so that the
+    history is only scanned a single time regardless of how many objects
+    are being purged.
+
+    Returns a |list| of the evicted keys, as |str|.
+
+    """
+    ids = {id(o) for o in objs if not _is_atom(o)} - _SINGLETON_IDS
+    evicted = []
+
+    if not ids:
+        return evicted
+
+    out = ns.get("Out")
+    if isinstance(out, dict):
+        for n in [n for n, v in out.items() if id(v) in ids]:
+            del out[n]
+            evicted.append("Out[{0}]".format(n))
+
+            key = "_{0}".format(n)
+            if key in ns and id(ns[key]) in ids:
+                del ns[key]
+                evicted.append(key)
+
+    for key in ("_", "__", "___"):
+        if key in ns and id(ns[key]) in ids:
+            ns[key] = ""
+            evicted.append(key)
+
+    # The display hook holds its own copies of _, __ and ___
+    get_ipython = ns.get("get_ipython")
+    if callable(get_ipython):
+        hook = getattr(get_ipython(), "displayhook", None)
+        for key in ("_", "__", "___"):
+            if id(getattr(hook, key, None)) in ids:
+                setattr(hook, key, "")
+
+    return evicted
+
+
+@attr.s(slots=True)
+class AutoCleaner(object):
+    """Discard matching globals after every cell run in an IPython shell.
+
+    The cell source is inspected in a ``pre_run_cell`` handler to
+    find the names it might bind (see :func:`assigned_names`); in the
+    ``post_run_cell`` handler, just those names are checked against
+    the spec and removed from the namespace if they match. Per-cell
+    overhead is thus independent of the size of ``user_ns``.
+
+    Matching values are dropped outright (nothing is retained), so
+    the memory they hold can be reclaimed immediately.
+
+    """
+
+    #: IPython shell whose ``user_ns`` is managed.
+    shell = attr.ib()
+
+    #: |TempVars| instance providing the masking spec; must have been
+    #: constructed with ``ns=shell.user_ns``.
+    tempvars = attr.ib(validator=attr.validators.instance_of(TempVars))
+
+    # Names possibly bound by the currently running cell
+    _pending = attr.ib(init=False, repr=False, default=attr.Factory(set))
+
+    def __attrs_post_init__(self):
+        """Compile the spec patterns once, for reuse on every cell."""
+        self.tempvars._compile_patterns()
+
+    def pre_run_cell(self, info=None):
+        """Record the names the upcoming cell may bind."""
+        source = getattr(info, "raw_cell", None)
+        if source is None:
+            self._pending = set()
+            return
+
+        transform = getattr(self.shell, "transform_cell", None)
+        if transform is not None:
+            source = transform(source)
+
+        self._pending = assigned_names(source)
+
+    def post_run_cell(self, result=None):
+        """Discard any just-bound globals that match the spec."""
+        ns = self.tempvars._ns
+        matches = self.tempvars._matches
+
+        for name in self._pending:
+            if name in ns and matches(name, ns[name]):
+                del ns[name]
+
+        self._pending = set()
+
+    def register(self):
+        """Attach the handlers to the shell's event manager."""
+        self.shell.events.register("pre_run_cell", self.pre_run_cell)
+        self.shell.events.register("post_run_cell", self.post_run_cell)
+
+    def unregister(self):
+        """Detach the handlers from the shell's event manager."""
+        self.shell.events.unregister("pre_run_cell", self.pre_run_cell)
+        self.shell.events.unregister("post_run_cell", self.post_run_cell)
+
+
+# Active cleaners, keyed by id() of their shell
+_cleaners = {}
+
+
+def _stop(shell):
+    cleaner = _cleaners.pop(id(shell), None)
+    if cleaner is not None:
+        cleaner.unregister()
+
+
+def load_ipython_extension(ipython):
+    """Register the ``%autotemp`` line magic with `ipython`."""
+
+    def autotemp(line):
+        """Set (or, with no arguments, clear) the per-cell cleanup spec."""
+        _stop(ipython)
+
+        if not line.strip():
+            return
+
+        spec = ipython.ev("dict({0})".format(line))
+        cleaner = AutoCleaner(
+            shell=ipython, tempvars=TempVars(ns=ipython.user_ns, **spec)
+        )
+        cleaner.register()
+        _cleaners[id(ipython)] = cleaner
+
+    ipython.register_magic_function(autotemp, "line", "autotemp")
+
+
+def unload_ipython_extension(ipython):
+    """Stop any active per-cell cleanup in `ipython`."""
+    _stop(ipython)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
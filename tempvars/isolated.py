@@ -0,0 +1,198 @@
+r"""*Subinterpreter-isolated suites for* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+Runs the code of a suite in a subinterpreter, seeded from a declared
+subset of the parent namespace, with masking semantics matching those
+of an in-process ``with TempVars(...)`` block. With a per-interpreter
+GIL, several suites can run truly in parallel::
+
+    >>> suites = [
+    ...     IsolatedSuite(TempVars(starts=['t_'], ns=globals()), code,
+    ...                   imports=['data'], exports=['result_' + k])
+    ...     for k, code in codes.items()
+    ... ]
+    >>> for s in suites:
+    ...     s.start()
+    >>> for s in suites:
+    ...     s.join()
+
+Requires Python 3.14+ (:mod:`concurrent.interpreters`, :pep:`734`).
+Seeded and exported values must be picklable.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import pickle
+import threading
+
+import attr
+
+from .tempvars import TempVars
+
+# Run in the subinterpreter's __main__, after prepare_main() binds
+# `seed`, `code`, `exports` and `out`
+_BOOTSTRAP = (
+    "import pickle\n"
+    "ns = {'__name__': '__tempvars__'}\n"
+    "ns.update(pickle.loads(seed))\n"
+    "exec(code, ns)\n"
+    "out.put(pickle.dumps({k: ns[k] for k in exports if k in ns}))\n"
+)
+
+
+def _interpreters():
+    """Import the PEP 734 module, or raise :exc:`RuntimeError`."""
+    try:
+        from concurrent import interpreters
+    except ImportError:
+        raise RuntimeError(
+            "Isolated suites require subinterpreter support "
+            "(Python 3.14+, concurrent.interpreters)"
+        )
+
+    return interpreters
+
+
+@attr.s(slots=True)
+class IsolatedSuite(object):
+    """Run suite source code in a subinterpreter, with |TempVars| masking.
+
+    The semantics follow those of running `code` inside a
+    ``with tempvars:`` block in the parent namespace:
+
+    * Of the names in `imports`, only those present in the parent
+      namespace and *not* masked by the spec are seeded into the
+      subinterpreter; masked variables are invisible to the suite.
+    * On :meth:`join`, the names in `exports` bound by the suite are
+      returned to the parent namespace, except those matching the spec
+      (and not in its `export` list), which instead go to
+      ``tempvars.retained_tempvars`` (if `retain` is set).
+    * If the spec's `restore` is |False|, the masked variables are
+      discarded from the parent namespace; otherwise they are untouched,
+      the parent namespace never having been modified.
+
+    """
+
+    #: |TempVars| spec, bound to the parent namespace via its `ns`
+    #: argument (or constructed at the global scope).
+    tempvars = attr.ib(validator=attr.validators.instance_of(TempVars))
+
+    #: |str| source code of the suite.
+    code = attr.ib(validator=attr.validators.instance_of(str))
+
+    #: |list| of |str| - Parent variables to seed into the suite.
+    imports = attr.ib(default=attr.Factory(list))
+
+    #: |list| of |str| - Suite variables to bring back to the parent.
+    exports = attr.ib(default=attr.Factory(list))
+
+    _thread = attr.ib(init=False, repr=False, default=None)
+    _result = attr.ib(init=False, repr=False, default=None)
+
+    def seed(self):
+        """Return the |dict| of parent variables to seed into the suite."""
+        tv = self.tempvars
+        tv._compile_patterns()
+
+        return {
+            k: tv._ns[k]
+            for k in self.imports
+            if k in tv._ns and not tv._matches(k, tv._ns[k])
+        }
+
+    def finish(self, results):
+        """Apply the suite's `results` |dict| to the parent namespace."""
+        tv = self.tempvars
+        tv._compile_patterns()
+        keep = frozenset(tv.export or ())
+
+        tv.stored_nsvars.clear()
+        tv.retained_tempvars.clear()
+
+        for k, v in results.items():
+            if k not in keep and tv._matches(k, v):
+                if tv.retain:
+                    tv.retained_tempvars[k] = v
+            else:
+                tv._ns[k] = v
+
+        if not tv.restore:
+            tv._pop_to(tv.stored_nsvars, keep)
+            if not tv.retain:
+                tv.stored_nsvars.clear()
+
+    def start(self):
+        """Start the suite in a new subinterpreter, on a new thread."""
+        interpreters = _interpreters()
+
+        if self._thread is not None:
+            raise RuntimeError("IsolatedSuite has already been started")
+
+        interp = interpreters.create()
+        queue = interpreters.create_queue()
+        interp.prepare_main(
+            seed=pickle.dumps(self.seed()),
+            code=self.code,
+            exports=tuple(self.exports),
+            out=queue,
+        )
+
+        def run():
+            try:
+                interp.exec(_BOOTSTRAP)
+                self._result = (True, pickle.loads(queue.get()))
+            except BaseException as e:
+                self._result = (False, e)
+            finally:
+                interp.close()
+
+        self._thread = threading.Thread(target=run, daemon=True)
+        self._thread.start()
+
+    def join(self, timeout=None):
+        """Wait for the suite to finish and apply its results.
+
+        Re-raises (as ``concurrent.interpreters.ExecutionFailed``) any
+        exception raised by the suite, in which case the parent namespace
+        is left unmodified. Raises :exc:`TimeoutError` if the suite does
+        not finish within `timeout` seconds.
+
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            raise TimeoutError("Isolated suite still running")
+
+        ok, val = self._result
+        if not ok:
+            raise val
+
+        self.finish(val)
+
+    def run(self):
+        """Run the suite to completion: :meth:`start` then :meth:`join`."""
+        self.start()
+        self.join()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
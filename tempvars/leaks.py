@@ -0,0 +1,180 @@
+r"""*Leak detection for discarded temporaries in* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import gc
+import sys
+import time
+import types
+import weakref
+from collections import deque
+
+import attr
+
+
+def _describe(parent, child):
+    """Describe how `parent` refers to `child`, for a referrer chain."""
+    if isinstance(parent, dict):
+        for k, v in parent.items():
+            if v is child:
+                return "dict[{0!r}]".format(k)
+        return "dict (as key)"
+
+    if isinstance(parent, (list, tuple)):
+        for i, v in enumerate(parent):
+            if v is child:
+                return "{0}[{1}]".format(type(parent).__name__, i)
+
+    if isinstance(parent, types.FrameType):
+        return "frame of {0}()".format(parent.f_code.co_name)
+
+    return type(parent).__name__
+
+
+@attr.s(slots=True)
+class LeakChecker(object):
+    """Track discarded values by weak reference and explain survivors.
+
+    Values that cannot be weakly referenced (e.g., |list|, |dict|,
+    |int|, |str|) cannot be tracked; their names are collected in
+    :attr:`untracked` instead.
+
+    """
+
+    #: |dict| namespace the values were discarded from. Reaching it (or
+    #: any module namespace, or a live frame) ends a referrer chain.
+    ns = attr.ib(repr=False)
+
+    #: |list| of (name, :class:`weakref.ref`) for the tracked values.
+    tracked = attr.ib(init=False, repr=False, default=attr.Factory(list))
+
+    #: |list| of names of values that could not be weakly referenced.
+    untracked = attr.ib(init=False, default=attr.Factory(list))
+
+    def track(self, name, obj):
+        """Start tracking `obj`, discarded from the namespace as `name`."""
+        try:
+            self.tracked.append((name, weakref.ref(obj)))
+        except TypeError:
+            self.untracked.append(name)
+
+    def track_all(self, items):
+        """Start tracking each (name, value) pair of the iterable `items`."""
+        for name, obj in items:
+            self.track(name, obj)
+
+    def alive(self):
+        """Return the |list| of names whose values are still alive."""
+        return [name for name, ref in self.tracked if ref() is not None]
+
+    def report(self, budget=0.5):
+        """Find what keeps each still-alive tracked value from being freed.
+
+        Returns a |dict| mapping the name of each surviving value to the
+        shortest referrer chain found for it, as a |list| of |str|
+        descriptions running from the root to the value. The search
+        (breadth-first over :func:`gc.get_referrers`) for each value is
+        abandoned after `budget` seconds, in which case the value maps to
+        |None|. An empty chain means the value is only held by objects not
+        tracked by the garbage collector.
+
+        """
+        result = {}
+
+        # Once for all values, and outside their time budgets; it also
+        # frees values only kept alive by unreachable cycles
+        gc.collect()
+
+        for name, ref in self.tracked:
+            obj = ref()
+            if obj is not None:
+                result[name] = self._chain(obj, budget)
+                del obj
+
+        return result
+
+    def _chain(self, obj, budget):
+        """Breadth-first search for the shortest chain from a root."""
+        roots = {
+            id(getattr(m, "__dict__", None))
+            for m in list(sys.modules.values())
+        }
+        roots.add(id(self.ns))
+
+        this_frame = sys._getframe()
+        parents = {id(obj): None}
+        queue = deque([obj])
+
+        # Referrer lists are kept alive so their ids stay unique
+        held = []
+        internal = {id(parents), id(queue), id(held), id(this_frame)}
+        deadline = time.perf_counter() + budget
+
+        try:
+            while queue:
+                if time.perf_counter() > deadline:
+                    return None
+
+                child = queue.popleft()
+                referrers = gc.get_referrers(child)
+                held.append(referrers)
+                internal.add(id(referrers))
+
+                for ref in referrers:
+                    if id(ref) in internal or id(ref) in parents:
+                        continue
+                    if isinstance(ref, types.FrameType) and (
+                        ref.f_code is this_frame.f_code
+                        or ref.f_code is self.report.__code__
+                    ):
+                        continue
+
+                    parents[id(ref)] = child
+
+                    if id(ref) in roots or isinstance(ref, types.FrameType):
+                        return self._unwind(ref, parents)
+
+                    queue.append(ref)
+
+            return []
+        finally:
+            del this_frame, parents, queue, held
+
+    @staticmethod
+    def _unwind(root, parents):
+        """Rebuild the chain of descriptions from `root` down."""
+        chain = []
+        parent = root
+        child = parents[id(root)]
+
+        while child is not None:
+            chain.append(_describe(parent, child))
+            parent, child = child, parents[id(child)]
+
+        return chain
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
@@ -0,0 +1,225 @@
+r"""*Memoization of suite results for* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+Backs the `inputs` argument of |TempVars|: a suite's `export` values
+are cached, keyed by the location and code of the |with| statement and
+by fingerprints of the values of its `inputs`, in a process-wide
+:class:`MemoCache` bounded in (estimated) bytes.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import hashlib
+import marshal
+import pickle
+import threading
+import types
+from collections import OrderedDict
+
+import attr
+
+from .sizing import approx_size
+
+# Immutable types fingerprinted by value, without hashing their content
+_ATOMS = frozenset(
+    (type(None), bool, int, float, complex, str, bytes, type(Ellipsis))
+)
+
+
+def _digest(chunks):
+    if hasattr(hashlib, "blake2b"):
+        h = hashlib.blake2b(digest_size=16)
+    else:  # pragma: no cover
+        # Python < 3.6
+        h = hashlib.sha256()
+    for c in chunks:
+        h.update(c)
+    return h.digest()
+
+
+def code_fingerprint(code):
+    """Return a digest identifying the compiled `code` object.
+
+    Covers the bytecode, constants and names of `code` (and of any code
+    nested in it), so that different code compiled under the same file
+    name, such as two ``<string>`` suites, gets different digests.
+
+    """
+    return _digest([marshal.dumps(code)])
+
+
+def fingerprint(value):
+    """Return a hashable fingerprint of `value`, or |None| if it has none.
+
+    Immutable scalars (and |tuple|/|frozenset| containers of them) are
+    their own fingerprints, so they cost only a |dict| lookup.
+    Buffer-backed values (NumPy arrays, :class:`bytearray`, etc.) are
+    digested directly from their memory. Functions are fingerprinted by
+    their code, defaults and closure contents, since they pickle by name
+    only; for the same reason, classes have no fingerprint. Anything else
+    is digested from its protocol-5 pickle (before Python 3.8, from its
+    pickle at the highest protocol available). Values that cannot be
+    pickled have no fingerprint.
+
+    """
+    tp = type(value)
+
+    if tp in _ATOMS:
+        return (tp, value)
+
+    if tp is tuple or tp is frozenset:
+        parts = [fingerprint(v) for v in value]
+        if None in parts:
+            return None
+        return (tp, tp(parts))
+
+    if tp is types.FunctionType:
+        try:
+            cells = tuple(c.cell_contents for c in value.__closure__ or ())
+            parts = (
+                fingerprint(value.__defaults__),
+                fingerprint(value.__kwdefaults__),
+                fingerprint(cells),
+            )
+        except (ValueError, RecursionError):
+            # Empty or self-referencing closure cells
+            return None
+
+        if None in parts:
+            return None
+        return (tp, code_fingerprint(value.__code__), parts)
+
+    if isinstance(value, type):
+        return None
+
+    try:
+        mv = memoryview(value)
+    except (TypeError, ValueError, BufferError):
+        pass
+    else:
+        with mv:
+            data = mv.cast("B") if mv.c_contiguous else mv.tobytes()
+            meta = "{0}|{1}|{2}".format(tp.__qualname__, mv.format, mv.shape)
+            return (tp, _digest([meta.encode(), data]))
+
+    raw = []
+    try:
+        if pickle.HIGHEST_PROTOCOL >= 5:
+            data = pickle.dumps(
+                value, protocol=5, buffer_callback=raw.append
+            )
+        else:
+            # Python < 3.8: buffers are pickled in-band
+            data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    except Exception:
+        return None
+
+    return (tp, _digest([data] + [b.raw() for b in raw]))
+
+
+@attr.s(slots=True)
+class MemoCache(object):
+    """Least-recently-used cache of suite exports, bounded in bytes.
+
+    Cached values are handed back as-is, not copied: mutating an export
+    after the suite also changes what later cache hits rebind.
+
+    """
+
+    #: |int| budget for the estimated total size (see
+    #: :func:`~tempvars.sizing.approx_size`) of the cached exports.
+    #: Results larger than this on their own are not cached.
+    max_bytes = attr.ib(
+        default=2 ** 30, validator=attr.validators.instance_of(int)
+    )
+
+    #: :class:`~collections.OrderedDict` mapping each key to a (estimated
+    #: size, exports |dict|) |tuple|, least recently used first.
+    store = attr.ib(
+        init=False, repr=False, default=attr.Factory(OrderedDict)
+    )
+
+    #: |int| total estimated size of the cached exports.
+    store_bytes = attr.ib(init=False, default=0)
+
+    #: |int| number of lookups that found an entry.
+    hits = attr.ib(init=False, default=0)
+
+    #: |int| number of lookups that did not.
+    misses = attr.ib(init=False, default=0)
+
+    _lock = attr.ib(
+        init=False, repr=False, default=attr.Factory(threading.Lock)
+    )
+
+    def get(self, key):
+        """Return the exports |dict| cached for `key`, or |None|."""
+        with self._lock:
+            entry = self.store.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.store.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, exports):
+        """Cache the |dict| `exports` under `key`, evicting as needed."""
+        size = sum(map(approx_size, exports.values()))
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self.store.pop(key, None)
+            if old is not None:
+                self.store_bytes -= old[0]
+
+            self.store[key] = (size, dict(exports))
+            self.store_bytes += size
+
+            while self.store_bytes > self.max_bytes:
+                self.store_bytes -= self.store.popitem(last=False)[1][0]
+
+    def clear(self):
+        """Empty the cache and reset its counters."""
+        with self._lock:
+            self.store.clear()
+            self.store_bytes = self.hits = self.misses = 0
+
+
+_default = []
+_default_lock = threading.Lock()
+
+
+def default_cache():
+    """Return the process-wide :class:`MemoCache` used by |TempVars|."""
+    with _default_lock:
+        if not _default:
+            _default.append(MemoCache())
+
+    return _default[0]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
@@ -0,0 +1,246 @@
+r"""*Persistent on-disk store of discarded temporaries for* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+Values saved under a scope label survive kernel restarts, and are
+loaded lazily, memory-mapped where possible::
+
+    >>> with TempVars(starts=['t_'], persist='.tempvars', label='fit'):
+    ...     t_jac = expensive_jacobian(params)
+    >>> # ... after a restart ...
+    >>> t_jac = DiskStore('.tempvars').load('fit')['t_jac']
+
+NumPy arrays (without object fields) are written as ``.npy`` files and
+loaded with ``mmap_mode='r'``. Other values are pickled with protocol 5,
+each out-of-band buffer going to a file of its own, which is
+memory-mapped on load and handed to :func:`pickle.loads`. Requires
+Python 3.8+.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import json
+import mmap
+import os
+import pickle
+import shutil
+from collections.abc import Mapping
+
+import attr
+
+# Name of the per-label index file
+_INDEX = "index.json"
+
+
+def _is_plain_ndarray(value):
+    """Indicate whether `value` can be saved as a raw ``.npy`` file."""
+    return (
+        type(value).__module__ == "numpy"
+        and hasattr(value, "dtype")
+        and not value.dtype.hasobject
+    )
+
+
+def _map_file(path):
+    """Return a read-only :class:`memoryview` of the file at `path`."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class PersistedVars(Mapping):
+    """Read-only mapping of the variables saved under one label.
+
+    Each value is loaded from disk on first access, and cached. Arrays
+    and out-of-band buffers are memory-mapped read-only, so they occupy
+    RAM only as their pages are touched.
+
+    """
+
+    def __init__(self, path, index):
+        """Wrap the label directory `path`, described by `index`."""
+        self._path = path
+        self._index = index
+        self._cache = {}
+
+    def __getitem__(self, key):
+        """Return the (loaded) value for `key`."""
+        if key in self._cache:
+            return self._cache[key]
+
+        entry = self._index[key]
+        path = os.path.join(self._path, entry["file"])
+
+        if entry["kind"] == "npy":
+            import numpy as np
+
+            val = np.load(path, mmap_mode="r")
+        else:
+            bufs = [
+                _map_file(os.path.join(self._path, b))
+                for b in entry["buffers"]
+            ]
+            with open(path, "rb") as f:
+                val = pickle.load(f, buffers=bufs)
+
+        self._cache[key] = val
+        return val
+
+    def __iter__(self):
+        """Iterate over the saved variable names."""
+        return iter(self._index)
+
+    def __len__(self):
+        """Return the number of saved variables."""
+        return len(self._index)
+
+
+@attr.s(slots=True)
+class DiskStore(object):
+    """Directory of scope labels, each holding a set of saved variables.
+
+    Each label is a subdirectory of `root`, replaced as a whole by every
+    :meth:`save` under that label.
+
+    """
+
+    #: |str| path of the store's root directory, created as needed.
+    root = attr.ib(validator=attr.validators.instance_of(str))
+
+    def _label_path(self, label):
+        if (
+            not isinstance(label, str)
+            or not label
+            or label.startswith(".")
+            or os.sep in label
+            or (os.altsep and os.altsep in label)
+        ):
+            raise ValueError("Invalid scope label: {0!r}".format(label))
+
+        return os.path.join(self.root, label)
+
+    def save(self, label, values):
+        """Write the |dict| `values` under `label`, replacing any prior set.
+
+        Values that cannot be pickled are skipped. Returns the |list| of
+        the names actually saved.
+
+        """
+        dest = self._label_path(label)
+        tmp = os.path.join(self.root, ".{0}.{1}".format(label, os.getpid()))
+        old = tmp + ".old"
+
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+        index = {}
+
+        for i, (name, val) in enumerate(values.items()):
+            if _is_plain_ndarray(val):
+                import numpy as np
+
+                fname = "{0}.npy".format(i)
+                np.save(os.path.join(tmp, fname), val, allow_pickle=False)
+                index[name] = {"kind": "npy", "file": fname, "buffers": []}
+                continue
+
+            raw = []
+            try:
+                data = pickle.dumps(
+                    val, protocol=5, buffer_callback=raw.append
+                )
+            except Exception:
+                continue
+
+            entry = {"kind": "pickle", "file": "{0}.pkl".format(i)}
+            entry["buffers"] = [
+                "{0}.{1}.buf".format(i, j) for j in range(len(raw))
+            ]
+
+            with open(os.path.join(tmp, entry["file"]), "wb") as f:
+                f.write(data)
+            for fname, buf in zip(entry["buffers"], raw):
+                with open(os.path.join(tmp, fname), "wb") as f:
+                    f.write(buf.raw())
+
+            index[name] = entry
+
+        with open(os.path.join(tmp, _INDEX), "w") as f:
+            json.dump(index, f)
+
+        # Swap in the complete set, moving any prior one aside first so
+        # that `dest` always holds a complete set; files still mapped from
+        # a prior load stay valid until unmapped (on POSIX)
+        shutil.rmtree(old, ignore_errors=True)
+
+        try:
+            os.replace(dest, old)
+        except FileNotFoundError:
+            old = None
+
+        try:
+            os.replace(tmp, dest)
+        except OSError:
+            if old is not None:
+                os.replace(old, dest)
+            raise
+
+        if old is not None:
+            shutil.rmtree(old, ignore_errors=True)
+
+        return list(index)
+
+    def load(self, label):
+        """Return a :class:`PersistedVars` of the values saved under `label`.
+
+        Raises :exc:`KeyError` if nothing has been saved under `label`.
+
+        """
+        path = self._label_path(label)
+
+        try:
+            with open(os.path.join(path, _INDEX)) as f:
+                index = json.load(f)
+        except FileNotFoundError:
+            raise KeyError(label)
+
+        return PersistedVars(path, index)
+
+    def labels(self):
+        """Return a sorted |list| of the labels in the store."""
+        if not os.path.isdir(self.root):
+            return []
+
+        return sorted(
+            d
+            for d in os.listdir(self.root)
+            if not d.startswith(".")
+            and os.path.isfile(os.path.join(self.root, d, _INDEX))
+        )
+
+    def delete(self, label):
+        """Remove everything saved under `label`."""
+        shutil.rmtree(self._label_path(label), ignore_errors=True)
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
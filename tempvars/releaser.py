@@ -0,0 +1,121 @@
+r"""*Background release of discarded temporaries for* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import queue
+import threading
+
+import attr
+
+from .sizing import approx_size
+
+
+@attr.s(slots=True)
+class Releaser(object):
+    """Drop the last references to objects on a background thread.
+
+    Deallocating a huge nested structure can take seconds; handing its
+    last reference to a :class:`Releaser` moves that work off the
+    calling thread. Note that deallocation still needs the GIL, so it
+    is interleaved with, rather than fully parallel to, other Python
+    code.
+
+    The queue of pending batches holds at most `maxsize` entries;
+    :meth:`submit` blocks while it is full.
+
+    """
+
+    #: |int| maximum number of batches waiting to be released.
+    maxsize = attr.ib(default=64, validator=attr.validators.instance_of(int))
+
+    #: |int| estimated size (see :func:`~tempvars.sizing.approx_size`) of
+    #: the objects submitted but not yet released.
+    deferred_bytes = attr.ib(init=False, default=0)
+
+    #: |int| estimated size of all objects released so far.
+    released_bytes = attr.ib(init=False, default=0)
+
+    _queue = attr.ib(init=False, repr=False)
+    _lock = attr.ib(
+        init=False, repr=False, default=attr.Factory(threading.Lock)
+    )
+    _thread = attr.ib(init=False, repr=False, default=None)
+
+    @_queue.default
+    def _queue_default(self):
+        return queue.Queue(self.maxsize)
+
+    def submit(self, objs):
+        """Queue the |list| `objs` for release.
+
+        `objs` is emptied on the background thread; the caller must not
+        keep any other reference to its contents for them to be freed
+        there.
+
+        """
+        est = sum(map(approx_size, objs))
+
+        with self._lock:
+            self.deferred_bytes += est
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="tempvars-releaser", daemon=True
+                )
+                self._thread.start()
+
+        self._queue.put((objs, est))
+
+    def flush(self):
+        """Wait until all submitted objects have been released."""
+        self._queue.join()
+
+    def _run(self):
+        while True:
+            objs, est = self._queue.get()
+            try:
+                objs.clear()
+                del objs
+            finally:
+                with self._lock:
+                    self.deferred_bytes -= est
+                    self.released_bytes += est
+                self._queue.task_done()
+
+
+_default = []
+_default_lock = threading.Lock()
+
+
+def default_releaser():
+    """Return the process-wide :class:`Releaser` used by |TempVars|."""
+    with _default_lock:
+        if not _default:
+            _default.append(Releaser())
+
+    return _default[0]
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
@@ -0,0 +1,138 @@
+r"""*Shared-memory hand-off of discarded temporaries in* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+Requires Python 3.8+ (:mod:`multiprocessing.shared_memory`).
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import attr
+
+
+def _kind(value):
+    """Classify a buffer-backed value for reconstruction on attach."""
+    if type(value).__module__ == "numpy" and hasattr(value, "dtype"):
+        return "ndarray"
+    if isinstance(value, (bytes, bytearray)):
+        return type(value).__name__
+    return "memoryview"
+
+
+def attach(descriptor):
+    """Attach to a shared-memory block described by `descriptor`.
+
+    `descriptor` is one of the values of :attr:`SharedExport.table`;
+    it is a plain |dict|, and so is cheap to send to worker processes.
+
+    Returns a |tuple| of the attached
+    :class:`~multiprocessing.shared_memory.SharedMemory` and a value
+    backed by it (zero-copy): a NumPy array for arrays, a
+    :class:`memoryview` otherwise. The
+    :class:`~multiprocessing.shared_memory.SharedMemory` must be kept
+    alive, and should be closed by the caller once the value is no
+    longer needed.
+
+    """
+    from multiprocessing.shared_memory import SharedMemory
+
+    shm = SharedMemory(name=descriptor["shm"])
+    buf = shm.buf[: descriptor["nbytes"]]
+
+    if descriptor["kind"] == "ndarray":
+        import numpy as np
+
+        value = np.ndarray(
+            descriptor["shape"], dtype=descriptor["dtype"], buffer=buf
+        )
+    else:
+        value = buf.cast(descriptor["format"], descriptor["shape"])
+
+    return shm, value
+
+
+@attr.s(slots=True)
+class SharedExport(object):
+    """Shared-memory blocks holding copies of buffer-backed values.
+
+    The creating process owns the blocks: call :meth:`release` once the
+    worker processes are done with them.
+
+    """
+
+    #: |dict| mapping each exported variable name to a picklable
+    #: descriptor of its block, for use with :func:`attach`.
+    table = attr.ib(init=False, default=attr.Factory(dict))
+
+    # SharedMemory objects, keyed by variable name
+    _blocks = attr.ib(init=False, repr=False, default=attr.Factory(dict))
+
+    def add(self, name, value):
+        """Copy `value` into a new block if it supports the buffer protocol.
+
+        Returns |True| if `value` was exported, |False| if it was skipped.
+
+        """
+        from multiprocessing.shared_memory import SharedMemory
+
+        try:
+            mv = memoryview(value)
+        except (TypeError, ValueError, BufferError):
+            # ValueError: e.g. NumPy datetime64 arrays, whose dtype has
+            # no buffer-protocol format
+            return False
+
+        nbytes = mv.nbytes
+        shm = SharedMemory(create=True, size=max(nbytes, 1))
+
+        if mv.c_contiguous:
+            shm.buf[:nbytes] = mv.cast("B")
+        else:
+            shm.buf[:nbytes] = mv.tobytes()
+
+        desc = {
+            "shm": shm.name,
+            "nbytes": nbytes,
+            "kind": _kind(value),
+            "format": mv.format,
+            "shape": mv.shape,
+        }
+        if desc["kind"] == "ndarray":
+            desc["dtype"] = value.dtype.str
+
+        mv.release()
+        self._blocks[name] = shm
+        self.table[name] = desc
+        return True
+
+    def release(self):
+        """Close and unlink all of the blocks."""
+        for shm in self._blocks.values():
+            shm.close()
+            shm.unlink()
+
+        self._blocks.clear()
+        self.table.clear()
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
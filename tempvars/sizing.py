@@ -0,0 +1,58 @@
+r"""*Cheap object size estimates for* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import sys
+
+
+def approx_size(obj):
+    """Estimate the memory held by `obj`, in bytes, without walking it.
+
+    Uses ``obj.nbytes`` where available (NumPy arrays, pandas Series,
+    :class:`memoryview`), a shallow ``obj.memory_usage()`` for pandas
+    DataFrames, and :func:`sys.getsizeof` otherwise. The last is
+    *shallow*: for containers, only the container itself is counted,
+    not its contents.
+
+    """
+    nbytes = getattr(obj, "nbytes", None)
+    if isinstance(nbytes, int):
+        return nbytes
+
+    usage = getattr(obj, "memory_usage", None)
+    if callable(usage) and not isinstance(obj, type):
+        try:
+            return int(usage(index=True, deep=False).sum())
+        except Exception:
+            pass
+
+    try:
+        return sys.getsizeof(obj)
+    except TypeError:
+        return 0
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
@@ -0,0 +1,206 @@
+r"""*Background sweeping of matching globals for* ``tempvars``.
+
+This module is part of ``tempvars``,
+a context manager for handling temporary variables in
+Jupyter Notebook, IPython, etc.
+
+Intended for long-running REPL services, where temporaries tend to be
+left behind in a namespace between sessions::
+
+    >>> sw = Sweeper(TempVars(starts=['t_'], ns=session_globals),
+    ...              interval=300, max_bytes=2**30)
+    >>> sw.start()
+
+**Author**
+    Brian Skinn (bskinn@alum.mit.edu)
+
+**File Created**
+    18 Oct 2026
+
+**Copyright**
+    \(c) Brian Skinn 2017-2026
+
+**Source Repository**
+    http://www.github.com/bskinn/tempvars
+
+**Documentation**
+    http://tempvars.readthedocs.io
+
+**License**
+    The MIT License; see |license_txt|_ for full license terms
+
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+import attr
+
+from .sizing import approx_size
+from .tempvars import TempVars
+
+_MISSING = object()
+
+
+@attr.s(slots=True)
+class Sweeper(object):
+    """Periodically pop globals matching a spec into a bounded store.
+
+    Each sweep pops every variable of the spec's namespace that matches
+    its `names`/`starts`/`ends`/`contains` patterns (and is not listed in
+    its `export`), or whose value matches its `types`/`min_size`, into
+    :attr:`store`, from which it can be recovered for
+    a while. Entries older than `max_age` seconds are evicted, and then
+    the oldest entries beyond a total (estimated) size of `max_bytes`.
+
+    The namespace is scanned in slices of at most `slice_time` seconds,
+    between which the sweeping thread sleeps briefly so that the thread
+    running user code can proceed.
+
+    """
+
+    #: |TempVars| instance providing the spec and, via its `ns`
+    #: argument, the namespace to sweep.
+    tempvars = attr.ib(validator=attr.validators.instance_of(TempVars))
+
+    #: |float| seconds between sweeps, when running in the background.
+    interval = attr.ib(default=60.0)
+
+    #: |int| byte budget for :attr:`store`, or |None| for no limit.
+    max_bytes = attr.ib(default=None)
+
+    #: |float| maximum age of :attr:`store` entries in seconds, or |None|
+    #: for no limit.
+    max_age = attr.ib(default=None)
+
+    #: |float| maximum duration in seconds of a single scan slice.
+    slice_time = attr.ib(default=0.005)
+
+    #: :class:`~collections.OrderedDict` mapping each swept name to a
+    #: (timestamp, estimated size, value) |tuple|, oldest first.
+    store = attr.ib(
+        init=False, repr=False, default=attr.Factory(OrderedDict)
+    )
+
+    #: |int| total estimated size of the values in :attr:`store`.
+    store_bytes = attr.ib(init=False, default=0)
+
+    _lock = attr.ib(
+        init=False, repr=False, default=attr.Factory(threading.Lock)
+    )
+    _stop = attr.ib(
+        init=False, repr=False, default=attr.Factory(threading.Event)
+    )
+    _thread = attr.ib(init=False, repr=False, default=None)
+
+    def __attrs_post_init__(self):
+        """Compile the spec patterns once, for reuse on every sweep."""
+        self.tempvars._compile_patterns()
+
+    def sweep(self):
+        """Run one sweep pass; return the |list| of names swept."""
+        ns = self.tempvars._ns
+        matches = self.tempvars._matches
+        keep = frozenset(self.tempvars.export or ())
+        swept = []
+
+        # Each slice excludes TempVars entry/exit on the same namespace
+        lock = self.tempvars._lock
+        lock.acquire()
+        slice_end = time.perf_counter() + self.slice_time
+
+        try:
+            for key in list(ns):
+                if time.perf_counter() > slice_end:
+                    # Let other threads run before the next slice
+                    lock.release()
+                    time.sleep(0.0005)
+                    lock.acquire()
+                    slice_end = time.perf_counter() + self.slice_time
+
+                val = ns.get(key, _MISSING)
+                if val is _MISSING or key in keep or not matches(key, val):
+                    continue
+
+                # Keep what was actually unbound, should the name have been
+                # rebound or deleted meanwhile by unlocked code
+                val = ns.pop(key, _MISSING)
+                if val is _MISSING:
+                    continue
+
+                self._add(key, val)
+                swept.append(key)
+        finally:
+            lock.release()
+
+        self._evict()
+        return swept
+
+    def _add(self, key, val):
+        size = approx_size(val)
+
+        with self._lock:
+            old = self.store.pop(key, None)
+            if old is not None:
+                self.store_bytes -= old[1]
+
+            self.store[key] = (time.time(), size, val)
+            self.store_bytes += size
+
+    def _evict(self):
+        store = self.store
+
+        with self._lock:
+            if self.max_age is not None:
+                cutoff = time.time() - self.max_age
+                while store and next(iter(store.values()))[0] < cutoff:
+                    self.store_bytes -= store.popitem(last=False)[1][1]
+
+            if self.max_bytes is not None:
+                while store and self.store_bytes > self.max_bytes:
+                    self.store_bytes -= store.popitem(last=False)[1][1]
+
+    def recover(self, name):
+        """Remove `name` from :attr:`store` and return its value.
+
+        Raises :exc:`KeyError` if `name` is not (or is no longer) stored.
+
+        """
+        with self._lock:
+            _, size, val = self.store.pop(name)
+            self.store_bytes -= size
+
+        return val
+
+    def start(self):
+        """Start sweeping every `interval` seconds on a daemon thread."""
+        if self._thread is not None and self._thread.is_alive():
+            raise RuntimeError("Sweeper is already running")
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="tempvars-sweeper", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        """Stop the background thread, waiting up to `timeout` seconds."""
+        self._stop.set()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sweep()
+            except RuntimeError:
+                # The namespace was mutated mid-pass; try again on the
+                # next tick
+                continue
+
+
+if __name__ == "__main__":  # pragma: no cover
+    print("Module not executable.")
@@ -24,8 +24,54 @@ Jupyter Notebook, IPython, etc.
 
 """
 
+import threading
+import weakref
+
 import attr
 
+from .budget import ACTIONS
+from .compression import METHODS, StoredVars
+
+_MISSING = object()
+
+# IPython's history bookkeeping, never matched by value (see _matches);
+# _N and _iN are checked separately
+_IPYTHON_NAMES = frozenset(
+    ("_", "__", "___", "_i", "_ii", "_iii", "In", "Out", "_ih", "_oh", "_dh")
+)
+
+
+def _is_ipython_name(key):
+    """Indicate whether `key` is one of IPython's history variables."""
+    if key in _IPYTHON_NAMES:
+        return True
+
+    if key[:1] != "_":
+        return False
+
+    return key[1:].isdigit() or (key[1:2] == "i" and key[2:].isdigit())
+
+
+# Per-namespace locks, keyed by id() of the namespace; each lock lives
+# as long as some TempVars instance on its namespace holds it
+_ns_locks = weakref.WeakValueDictionary()
+_ns_locks_guard = threading.Lock()
+
+
+def _ns_lock(ns):
+    """Return the re-entrant lock serializing |TempVars| steps on `ns`.
+
+    Each namespace gets its own lock, so that scopes on unrelated
+    namespaces never contend.
+
+    """
+    with _ns_locks_guard:
+        lock = _ns_locks.get(id(ns))
+        if lock is None:
+            lock = _ns_locks[id(ns)] = threading.RLock()
+
+    return lock
+
 
 @attr.s(slots=True)
 class TempVars(object):
@@ -57,6 +103,166 @@ class TempVars(object):
         into the |with| suite are restored to the namespace upon exit. If
         |False|, no variables are restored.
 
+    contains :
+        |list| of |str| - Variables will be treated as temporary if their
+        names *contain* any of these patterns (tested with ``in``).
+        All patterns are matched in a single pass over each name, by an
+        Aho-Corasick automaton (:mod:`tempvars.automaton`). Dunder names
+        are never matched.
+
+    regex :
+        |list| of |str| - Variables will be treated as temporary if their
+        names match any of these regular expressions *in full* (tested
+        with :meth:`re.Pattern.fullmatch`). Groups may only be referred
+        to by name, as the patterns are merged into one.
+
+    glob :
+        |list| of |str| - Variables will be treated as temporary if their
+        names match any of these shell-style wildcard patterns (as for
+        :func:`fnmatch.fnmatchcase`).
+
+        All `regex` and `glob` patterns are merged into a single compiled
+        alternation (cached process-wide), so a name is tested against all
+        of them in one call. Dunder names are never matched.
+
+    types :
+        |list| of |type| - Variables will be treated as temporary if their
+        *values* are instances of any of these types, however they are
+        named. The result of the subclass test is cached per concrete
+        type, so each value costs one |dict| lookup. Dunder names, and
+        IPython's history variables (``In``, ``Out``, ``_``, ``_N``,
+        ``_iN``, etc.), are never matched by value.
+
+    min_size :
+        |int| - Variables will be treated as temporary if the estimated
+        size of their *values* is at least this many bytes, per
+        :func:`~tempvars.sizing.approx_size` (``nbytes`` or
+        :func:`sys.getsizeof`; containers are not walked). Combined with
+        `types`, both must hold: ``types=[np.ndarray], min_size=10**8``
+        matches any array over 100 MB.
+
+    auto :
+        |bool| - If |True|, every variable created within the |with| suite
+        is treated as temporary, as found by comparing the set of names in
+        the namespace upon exit with that upon entry. Dunder names and
+        the bound :class:`TempVars` instance itself are exempt.
+
+    export :
+        |list| of |str| - Variables with these names are never discarded
+        upon exit (nor overwritten by restored values), even if they match
+        `names`/`starts`/`ends` or were created in `auto` mode.
+
+    rollback :
+        |bool| - If |True|, the namespace is checkpointed upon entry (after
+        masking), and upon exit every variable created, rebound or deleted
+        within the suite is rolled back, except those in `export`. Created
+        and rebound values are discarded as temporary variables. Masked
+        variables are still handled according to `restore`.
+
+    inputs :
+        |list| of |str| - If given, the values of the `export` variables
+        bound by the suite are cached upon a successful exit, keyed by the
+        location and code of the |with| statement and by fingerprints of
+        the values of these variables (see :mod:`tempvars.memo`). Upon a
+        later entry with matching inputs, the cached values are rebound and
+        :attr:`hit` is set to |True|; the suite body should then be
+        skipped, as in ``if not tv.hit:``.
+
+    retain :
+        |bool| - If |True|, the temporary variables discarded upon exit are
+        kept in :attr:`retained_tempvars`. If |False|, no references to
+        discarded values are kept by the instance.
+
+    track_leaks :
+        |bool| - If |True|, upon exit the discarded values are tracked by
+        weak reference, to check later whether anything else is keeping
+        them alive.
+
+    purge_outputs :
+        |bool| - If |True|, upon exit any IPython output-history
+        entries holding a discarded value are evicted, so that the history
+        does not keep it alive.
+
+    share :
+        |bool| - If |True|, upon exit buffer-backed temporary variables are
+        copied into shared memory, for zero-copy attachment by local worker
+        processes (see :mod:`tempvars.sharing`). Combine with
+        ``retain=False`` to keep only the shared copy. The blocks
+        exported at one exit are released at the next.
+
+    release_async :
+        |bool| - If |True| (and `retain` is |False|), values discarded upon
+        exit are deallocated on a background thread, so that the |with|
+        block returns without waiting for large structures to be freed.
+        See :mod:`tempvars.releaser` for flushing and metrics.
+
+    compress :
+        |str| - If ``'zlib'`` or ``'lzma'``, masked values estimated at
+        `compress_threshold` bytes or more are held compressed in
+        :attr:`stored_nsvars` while the suite runs, and decompressed on
+        restore or on first access. Only values referenced by nothing
+        else are compressed; these are restored as copies. Timings and
+        sizes are reported in ``tv.stored_nsvars.stats``.
+
+    compress_threshold :
+        |int| - Size threshold in bytes for `compress`; default 1 MiB.
+
+    compress_level :
+        |int| - Compression level for `compress`; default per library.
+
+    persist :
+        |str| - If given, upon exit the discarded temporary variables are
+        written under `label` to the on-disk store at this path,
+        replacing any set previously saved under that label, so that
+        they can be recovered after a kernel restart with
+        ``DiskStore(persist).load(label)`` (see :mod:`tempvars.persist`).
+
+    label :
+        |str| - Scope label for `persist`; required with it.
+
+    gc_freeze :
+        |bool| - If |True|, all objects tracked by the cyclic garbage
+        collector upon entry are frozen (:func:`gc.freeze`) for the
+        duration of the suite, so that collections only traverse objects
+        created within it. Upon exit, these are collected before the
+        objects are unfrozen, freeing any reference cycles among the
+        discarded values. Pause statistics are kept in :attr:`gc_stats`.
+
+    gc_threshold :
+        |tuple| of |int| - Thresholds (as for :func:`gc.set_threshold`) to
+        apply during the suite; requires `gc_freeze`.
+
+    max_rss :
+        |int| - If given, the resident set size of the process is polled
+        on a background thread during the suite (Linux only). Whenever it
+        exceeds this many bytes, the largest matching variables in the
+        namespace, and the largest masked values, are spilled to disk
+        until it no longer does; spilled masked values are loaded back
+        upon restore, and spilled temporaries can be recovered from
+        :attr:`spilled`. If that does not suffice, a
+        :exc:`~tempvars.budget.MemoryBudgetExceeded` is raised in the
+        thread running the suite. Spilling requires Python 3.8+.
+
+    rss_action :
+        |str| - ``'raise'`` to raise upon exceeding `max_rss` without
+        spilling first; default ``'spill'``.
+
+    local :
+        |bool| - If |True|, manage the local variables of the function in
+        which the instance is created, via its :pep:`667` write-through
+        ``frame.f_locals`` proxy (Python 3.13+). Since local variables
+        cannot be unbound through the proxy, masked and discarded locals
+        are instead rebound to |None|, which also releases their values.
+        Locals bound to |None| are thus treated as unbound. For the least
+        overhead in loops, create the instance once, outside the loop,
+        and re-enter it on each iteration.
+
+    ns :
+        |dict| - Namespace to manage, in place of the :func:`globals` of the
+        instantiating scope. Intended for tooling that manages a namespace
+        on a user's behalf (e.g., the IPython extension in
+        :mod:`tempvars.ipython`); the global-scope check is not applied.
+
 
     The :class:`TempVars` instance can be bound in the |with| statement for
     access to stored variables, etc.::
@@ -66,6 +272,15 @@ class TempVars(object):
 
     See the :doc:`usage examples <usage>` page for more information.
 
+    Entry into and exit from the |with| suite are each atomic with respect
+    to other :class:`TempVars` instances (and to
+    :class:`~tempvars.sweeper.Sweeper` slices) managing the *same*
+    namespace, on GIL and free-threaded builds alike: these steps are
+    serialized by a per-namespace lock, so instances on unrelated
+    namespaces never contend. Variables bound or deleted concurrently by
+    other code are tolerated, but the suites themselves share the
+    namespace, and so may still see one another's temporaries.
+
 
     **Class Members**
 
@@ -87,9 +302,78 @@ class TempVars(object):
     #: matching patterns.
     ends = attr.ib(default=None)
 
+    # ## Flag for whether to restore the prior namespace contents
+    #: |bool| flag indicating whether to restore the prior namespace
+    #: contents. **Can** be changed within the |with| suite.
+    restore = attr.ib(
+        default=True, validator=attr.validators.instance_of(bool)
+    )
+
+    # ## Further name-matching criteria; declared after `restore` to keep
+    # ## the positional order (names, starts, ends, restore) of the
+    # ## original release
+    #: |list| of |str| - All passed substring (``in``) matching
+    #: patterns.
+    contains = attr.ib(default=None)
+
+    #: |list| of |str| - All passed regular expressions.
+    regex = attr.ib(default=None)
+
+    #: |list| of |str| - All passed shell-style wildcard patterns.
+    glob = attr.ib(default=None)
+
+    # ## Value-based criteria
+    #: |list| of |type| - Variables will be treated as temporary if their
+    #: values are instances of any of these types (and, if `min_size` is
+    #: given, at least that large).
+    types = attr.ib(default=None)
+
+    @types.validator
+    def _types_validator(self, at, val):
+        if val is None:
+            return
+
+        if type(val) != list or not all(isinstance(t, type) for t in val):
+            raise TypeError("'{0}' must be a list of types".format(at.name))
+
+    #: |int| - Variables will be treated as temporary if the estimated
+    #: size in bytes of their values is at least this (and, if `types` is
+    #: given, they are instances of one of them).
+    min_size = attr.ib(
+        default=None,
+        validator=attr.validators.optional(attr.validators.instance_of(int)),
+    )
+
+    # ## Auto-temporary mode and exported names
+    #: |bool| flag indicating whether to treat *every* variable newly
+    #: created within the |with| suite as temporary, in addition to any
+    #: matching `names`/`starts`/`ends`.
+    auto = attr.ib(default=False, validator=attr.validators.instance_of(bool))
+
+    #: |list| of |str| - Variable names never to be discarded upon exit,
+    #: whether matching `names`/`starts`/`ends` or newly created in
+    #: `auto` mode.
+    export = attr.ib(default=None)
+
+    #: |bool| flag indicating whether to roll back, upon exit, every
+    #: binding created, rebound or deleted within the |with| suite,
+    #: other than those in `export`.
+    rollback = attr.ib(
+        default=False, validator=attr.validators.instance_of(bool)
+    )
+
+    #: |list| of |str| - Names of the variables whose values key the
+    #: memoized results of the suite, or |None| for no memoization.
+    inputs = attr.ib(default=None)
+
     @names.validator
     @starts.validator
     @ends.validator
+    @contains.validator
+    @regex.validator
+    @glob.validator
+    @export.validator
+    @inputs.validator
     def _var_pattern_validator(self, at, val):
         # Standard error for failure return
         te = TypeError("'{0}' must be a list of str".format(at.name))
@@ -104,29 +388,165 @@ class TempVars(object):
             if type(s) != str:
                 raise te
 
-            if at.name != "names" and (s == "_" or s == "__"):
+            if at.name not in ("names", "export", "inputs") and s in (
+                "_",
+                "__",
+            ):
                 raise ValueError(
                     "'_' and '__' are not permitted "
                     "for '{0}'".format(at.name)
                 )
 
+            if at.name == "regex":
+                import re
+
+                try:
+                    re.compile(s)
+                except re.error as e:
+                    raise ValueError(
+                        "Invalid 'regex' pattern {0!r}: {1}".format(s, e)
+                    )
+
+                from .automaton import has_numbered_ref
+
+                # Merging the patterns renumbers their groups
+                if has_numbered_ref(s):
+                    raise ValueError(
+                        "Numbered group references are not permitted "
+                        "in 'regex' pattern {0!r}; use named groups "
+                        "instead".format(s)
+                    )
+
             if at.name == "starts" and s.startswith("__"):
                 raise ValueError("'starts' may not start with '__'")
 
             if at.name == "ends" and s.endswith("__"):
                 raise ValueError("'ends' may not end with '__'")
 
-    # ## Flag for whether to restore the prior namespace contents
-    #: |bool| flag indicating whether to restore the prior namespace
-    #: contents. **Can** be changed within the |with| suite.
-    restore = attr.ib(
-        default=True, validator=attr.validators.instance_of(bool)
+    # ## Flag for whether to keep the discarded temporary variables
+    #: |bool| flag indicating whether to keep the temporary variables
+    #: discarded at exit in :attr:`retained_tempvars`. If |False| and
+    #: `restore` is also |False|, :attr:`stored_nsvars` is emptied at exit
+    #: as well, so that the instance holds no reference to any discarded
+    #: value.
+    retain = attr.ib(default=True, validator=attr.validators.instance_of(bool))
+
+    # ## Flag for whether to track discarded values for leaks
+    #: |bool| flag indicating whether to track the values discarded at
+    #: exit by weak reference, in a :class:`~tempvars.leaks.LeakChecker`
+    #: bound to :attr:`leaks`. Most useful with `retain` and `restore`
+    #: both |False|.
+    track_leaks = attr.ib(
+        default=False, validator=attr.validators.instance_of(bool)
+    )
+
+    # ## Flag for whether to purge IPython output-history references
+    #: |bool| flag indicating whether, upon exit, to evict from the
+    #: IPython output history (``Out``, ``_N``, ``_``/``__``/``___``)
+    #: any entries identical to a value discarded from the namespace. See
+    #: :func:`tempvars.ipython.purge_output_cache`.
+    purge_outputs = attr.ib(
+        default=False, validator=attr.validators.instance_of(bool)
+    )
+
+    # ## Flag for whether to export discarded values to shared memory
+    #: |bool| flag indicating whether, upon exit, to copy each discarded
+    #: temporary variable supporting the buffer protocol (NumPy arrays,
+    #: |bytes|, :class:`memoryview`, etc.) into a
+    #: :mod:`multiprocessing.shared_memory` block, described in
+    #: :attr:`shared`. Requires Python 3.8+.
+    share = attr.ib(default=False, validator=attr.validators.instance_of(bool))
+
+    # ## Flag for releasing discarded values on a background thread
+    #: |bool| flag indicating whether, upon exit, to hand the last
+    #: references to the discarded values to the background
+    #: :func:`~tempvars.releaser.default_releaser`, rather than releasing
+    #: them on the calling thread. Only effective with `retain` |False|.
+    release_async = attr.ib(
+        default=False, validator=attr.validators.instance_of(bool)
+    )
+
+    # ## Compression of large masked variables
+    #: |str| compression method (one of ``'zlib'`` or ``'lzma'``) for
+    #: large values held in :attr:`stored_nsvars` during the suite, or
+    #: |None| for no compression. Requires Python 3.8+.
+    compress = attr.ib(
+        default=None,
+        validator=attr.validators.optional(attr.validators.in_(METHODS)),
+    )
+
+    #: |int| estimated size in bytes (see
+    #: :func:`~tempvars.sizing.approx_size`) at or above which masked
+    #: values are compressed.
+    compress_threshold = attr.ib(
+        default=2 ** 20, validator=attr.validators.instance_of(int)
+    )
+
+    #: |int| compression level (``zlib``) or preset (``lzma``); |None|
+    #: for the library default.
+    compress_level = attr.ib(
+        default=None,
+        validator=attr.validators.optional(attr.validators.instance_of(int)),
+    )
+
+    # ## Persistent on-disk store for discarded values
+    #: |str| path of a :class:`~tempvars.persist.DiskStore` directory to
+    #: which the temporary variables discarded at exit are written, under
+    #: `label`, or |None| for no persistence. Requires Python 3.8+.
+    persist = attr.ib(
+        default=None,
+        validator=attr.validators.optional(attr.validators.instance_of(str)),
+    )
+
+    #: |str| scope label under which discarded values are persisted.
+    label = attr.ib(
+        default=None,
+        validator=attr.validators.optional(attr.validators.instance_of(str)),
+    )
+
+    # ## Cyclic-GC pause control
+    #: |bool| flag indicating whether to freeze the objects tracked by the
+    #: cyclic garbage collector upon entry, and to collect the objects
+    #: created within the suite upon exit (see :mod:`tempvars.gcontrol`).
+    #: Requires Python 3.7+.
+    gc_freeze = attr.ib(
+        default=False, validator=attr.validators.instance_of(bool)
     )
 
+    #: |tuple| of |int| garbage-collection thresholds to apply during the
+    #: suite, with `gc_freeze`, or |None|.
+    gc_threshold = attr.ib(default=None)
+
+    # ## Memory budget
+    #: |int| budget in bytes for the resident set size of the process
+    #: during the suite, or |None| for no budget (see
+    #: :mod:`tempvars.budget`).
+    max_rss = attr.ib(
+        default=None,
+        validator=attr.validators.optional(attr.validators.instance_of(int)),
+    )
+
+    #: |str| action upon exceeding `max_rss`: ``'spill'`` or ``'raise'``.
+    rss_action = attr.ib(
+        default="spill", validator=attr.validators.in_(ACTIONS)
+    )
+
+    # ## Flag for managing function locals instead of globals
+    #: |bool| flag indicating whether to manage the local variables of
+    #: the instantiating function, rather than its globals. Requires
+    #: Python 3.13+ (:pep:`667`).
+    local = attr.ib(default=False, validator=attr.validators.instance_of(bool))
+
     # ## Namespace for temp variable management.
-    # Always the globals at the level of the invoker of the TempVars
-    # instance (set below in _ns_default).
-    _ns = attr.ib(repr=False, init=False)
+    # Unless passed explicitly as `ns`, always the globals (or, if `local`,
+    # the write-through locals proxy) at the level of the invoker of the
+    # TempVars instance (set below in _ns_default).
+    _ns = attr.ib(repr=False)
+
+    @_ns.validator
+    def _ns_validator(self, at, val):
+        if not self.local and not isinstance(val, dict):
+            raise TypeError("'ns' must be a dict")
 
     @_ns.default
     def _ns_default(self):
@@ -148,6 +568,17 @@ class TempVars(object):
         # inside a class.
         fm = inspect.currentframe().f_back.f_back
 
+        if self.local:
+            import sys
+
+            # Before PEP 667, f_locals is a snapshot, not write-through
+            if sys.version_info < (3, 13):
+                raise RuntimeError(
+                    "Local-scope TempVars requires Python 3.13 or later"
+                )
+
+            return fm.f_locals
+
         # Refuse to work if not in top-level scope, since it's *known*
         # to behave incorrectly
         if fm.f_locals is not fm.f_globals:
@@ -157,8 +588,12 @@ class TempVars(object):
 
     # ## Internal vars, not set via the attrs __init__
     #: |dict| container for preserving variables masked from
-    #: the namespace, along with their associated values.
-    stored_nsvars = attr.ib(init=False, repr=False, default=attr.Factory(dict))
+    #: the namespace, along with their associated values. A
+    #: :class:`~tempvars.compression.StoredVars`, which inflates values
+    #: held compressed (see `compress`) on access.
+    stored_nsvars = attr.ib(
+        init=False, repr=False, default=attr.Factory(StoredVars)
+    )
 
     #: |dict| container for storing the temporary variables discarded from
     #: the namespace after exiting the |with| block.
@@ -166,16 +601,87 @@ class TempVars(object):
         init=False, repr=False, default=attr.Factory(dict)
     )
 
+    #: :class:`~tempvars.leaks.LeakChecker` tracking the values discarded
+    #: at the most recent exit, if `track_leaks` is |True|; else |None|.
+    leaks = attr.ib(init=False, repr=False, default=None)
+
+    #: :class:`~tempvars.sharing.SharedExport` holding the temporary
+    #: variables exported at the most recent exit, if `share` is |True|;
+    #: else |None|. Its blocks are released at the next exit (which
+    #: replaces it), and otherwise only by its
+    #: :meth:`~tempvars.sharing.SharedExport.release`.
+    shared = attr.ib(init=False, repr=False, default=None)
+
+    #: |list| of |str| names of the values written to the `persist` store
+    #: at the last exit, or |None|.
+    persisted = attr.ib(init=False, repr=False, default=None)
+
+    #: |bool| flag indicating whether the `export` values were rebound
+    #: from the memoization cache upon the last entry (see `inputs`).
+    hit = attr.ib(init=False, repr=False, default=False)
+
+    #: |dict| of garbage-collection statistics of the last use, with
+    #: `gc_freeze` (see :attr:`tempvars.gcontrol.GCGuard.stats`), or
+    #: |None|.
+    gc_stats = attr.ib(init=False, repr=False, default=None)
+
+    #: :class:`~tempvars.budget.SpillStore` of the values spilled to
+    #: disk to meet `max_rss`, or |None| (also with ``rss_action='raise'``).
+    spilled = attr.ib(init=False, repr=False, default=None)
+
+    # BudgetGuard enforcing max_rss
+    _budget = attr.ib(init=False, repr=False, default=None)
+
+    # GCGuard applying gc_freeze/gc_threshold
+    _gc_guard = attr.ib(init=False, repr=False, default=None)
+
+    # Memoization cache key computed on entry, in memo mode
+    _memo_key = attr.ib(init=False, repr=False, default=None)
+
+    # Compiled matching state, set on entry (see _compile_patterns)
+    _patterns = attr.ib(init=False, repr=False, default=None)
+
+    # Namespace keys present just after masking, in auto mode
+    _before = attr.ib(init=False, repr=False, default=None)
+
+    # Shallow copy of the namespace just after masking, in rollback mode
+    _snapshot = attr.ib(init=False, repr=False, default=None)
+
+    # Whether the instance is currently managing a scope
+    _active = attr.ib(init=False, repr=False, default=False)
+
+    # Value-criteria test compiled on entry, or None (see _compile_patterns)
+    _value_test = attr.ib(init=False, repr=False, default=None)
+
+    # Keys matched by the patterns on the last entry and exit (see explain)
+    _matched = attr.ib(init=False, repr=False, default=((), ()))
+
+    # Lock shared by all instances on the namespace (see _ns_lock)
+    _lock = attr.ib(init=False, repr=False)
+
+    @_lock.default
+    def _lock_default(self):
+        return _ns_lock(self._ns)
+
     def __attrs_post_init__(self):
         """Proofread identifier-matching arguments and copy for safety."""
         from copy import copy
         import warnings
 
         # Raise a warning if no patterns were passed
-        if all(
+        if not (
+            self.auto or self.rollback or self.inputs or self.types
+        ) and (self.min_size is None) and all(
             map(
                 lambda a: a is None or len(a) == 0,
-                (self.names, self.starts, self.ends),
+                (
+                    self.names,
+                    self.starts,
+                    self.ends,
+                    self.contains,
+                    self.regex,
+                    self.glob,
+                ),
             )
         ):
             warnings.warn(
@@ -184,23 +690,590 @@ class TempVars(object):
                 stacklevel=2,
             )
 
+        if self.compress is not None:
+            import pickle
+
+            if pickle.HIGHEST_PROTOCOL < 5:
+                raise RuntimeError("'compress' requires Python 3.8 or later")
+
+        if self.persist is not None:
+            import pickle
+
+            if pickle.HIGHEST_PROTOCOL < 5:
+                raise RuntimeError("'persist' requires Python 3.8 or later")
+
+            if self.label is None:
+                raise ValueError("'persist' requires a 'label'")
+
+            from .persist import DiskStore
+
+            # Raises ValueError on a label unusable as a directory name
+            DiskStore(self.persist)._label_path(self.label)
+
+        if self.gc_freeze:
+            import gc
+
+            if not hasattr(gc, "freeze"):
+                raise RuntimeError("'gc_freeze' requires Python 3.7 or later")
+
+            from .gcontrol import GCGuard
+
+            self._gc_guard = GCGuard(threshold=self.gc_threshold)
+
+        elif self.gc_threshold is not None:
+            raise ValueError("'gc_threshold' requires 'gc_freeze'")
+
+        if self.max_rss is not None:
+            from .budget import BudgetGuard
+
+            self._budget = BudgetGuard(
+                self, self.max_rss, action=self.rss_action
+            )
+            self.spilled = self._budget.spilled
+
+        if self.regex or self.glob:
+            import re
+
+            # Patterns valid alone may still clash once merged
+            try:
+                self._compile_patterns()
+            except re.error as e:
+                raise ValueError(
+                    "Invalid 'regex'/'glob' patterns: {0}".format(e)
+                )
+
+        if self.share:
+            try:
+                import multiprocessing.shared_memory  # noqa: F401
+            except ImportError:
+                raise RuntimeError("'share' requires Python 3.8 or later")
+
         # Copy any arguments that aren't None
         self.names = copy(self.names)
         self.starts = copy(self.starts)
         self.ends = copy(self.ends)
+        self.contains = copy(self.contains)
+        self.regex = copy(self.regex)
+        self.glob = copy(self.glob)
+        self.export = copy(self.export)
+        self.inputs = copy(self.inputs)
+        self.types = copy(self.types)
+
+    def _compile_patterns(self):
+        """Build the fast-path matching state from the pattern arguments.
+
+        Exact names go into a :class:`frozenset`, and the prefix/suffix
+        patterns into tuples so that a single :meth:`str.startswith` or
+        :meth:`str.endswith` call tests all of them at once. Substring
+        patterns are compiled (with process-wide caching) into one
+        Aho-Corasick automaton, and the `regex`/`glob` patterns into one
+        regular expression. The `types`/`min_size` criteria are
+        compiled into a single value test, with a per-type dispatch
+        table.
+
+        """
+        from .automaton import automaton, merged_regex
+
+        regex = None
+        if self.regex or self.glob:
+            regex = merged_regex(
+                tuple(self.regex or ()), tuple(self.glob or ())
+            ).fullmatch
+
+        self._patterns = (
+            frozenset(self.names or ()),
+            tuple(self.starts or ()),
+            tuple(self.ends or ()),
+            automaton(tuple(self.contains)) if self.contains else None,
+            regex,
+        )
+
+        if not self.types and self.min_size is None:
+            self._value_test = None
+            return
+
+        from .sizing import approx_size
+
+        types = tuple(self.types or ())
+        min_size = self.min_size
+        dispatch = {}
+
+        def value_test(val):
+            tp = type(val)
+            ok = dispatch.get(tp)
+            if ok is None:
+                ok = dispatch[tp] = not types or issubclass(tp, types)
+
+            return ok and (min_size is None or approx_size(val) >= min_size)
+
+        self._value_test = value_test
+
+    def _is_temp(self, key):
+        """Indicate whether `key` matches any of the compiled patterns."""
+        names, starts, ends, contains, regex = self._patterns
+
+        if key in names or key.startswith(starts) or key.endswith(ends):
+            return True
+
+        if contains is None and regex is None:
+            return False
+
+        if key.startswith("__") and key.endswith("__"):
+            return False
+
+        if contains is not None and contains.matches(key):
+            return True
+
+        return regex is not None and regex(key) is not None
+
+    def explain(self):
+        """Report how each pattern contributed to the last use.
+
+        Returns a |dict| keyed by criterion (``'names'``, ``'starts'``,
+        ``'ends'``, ``'contains'``, ``'regex'``, ``'glob'``). Each value
+        is a |dict| with:
 
-    def _pop_to(self, dest_dict, patterns, test_fxn):
+        ``'time'``
+            |float| seconds taken to test every key currently in the
+            namespace against that criterion's compiled patterns.
+
+        ``'patterns'``
+            |dict| mapping each pattern to a |dict| of the numbers of
+            keys it matched upon the last entry (``'enter'``) and exit
+            (``'exit'``), and of those matches that some other pattern
+            also matched (``'overlap'``). Patterns with no matches at all
+            cost scan time without ever masking anything.
+
+        Only keys matched by the patterns are counted, not those handled
+        by `auto` or `rollback`.
+
+        """
+        import fnmatch
+        import re
+        import time
+
+        from .automaton import automaton, merged_regex
+
+        # Compiled here, so as not to touch the state of an active scope
+        names = frozenset(self.names or ())
+        starts = tuple(self.starts or ())
+        ends = tuple(self.ends or ())
+        contains = automaton(tuple(self.contains)) if self.contains else None
+        regex = merged_regex(tuple(self.regex or ()), ()).fullmatch
+        glob = merged_regex((), tuple(self.glob or ())).fullmatch
+
+        def is_dunder(k):
+            return k.startswith("__") and k.endswith("__")
+
+        tests = {
+            "names": (
+                self.names,
+                lambda p, k: k == p,
+                lambda k: k in names,
+            ),
+            "starts": (
+                self.starts,
+                lambda p, k: k.startswith(p),
+                lambda k: k.startswith(starts),
+            ),
+            "ends": (
+                self.ends,
+                lambda p, k: k.endswith(p),
+                lambda k: k.endswith(ends),
+            ),
+            "contains": (
+                self.contains,
+                lambda p, k: p in k and not is_dunder(k),
+                lambda k: not is_dunder(k) and contains.matches(k),
+            ),
+            "regex": (
+                self.regex,
+                lambda p, k: not is_dunder(k) and re.fullmatch(p, k),
+                lambda k: not is_dunder(k) and regex(k),
+            ),
+            "glob": (
+                self.glob,
+                lambda p, k: not is_dunder(k) and fnmatch.fnmatchcase(k, p),
+                lambda k: not is_dunder(k) and glob(k),
+            ),
+        }
+
+        # Every (criterion, pattern) matching each key
+        hits = {}
+        for key in set(self._matched[0]) | set(self._matched[1]):
+            hits[key] = [
+                (crit, p)
+                for crit, (pats, match, _) in tests.items()
+                for p in pats or ()
+                if match(p, key)
+            ]
+
+        keys = list(self._ns)
+        report = {}
+
+        for crit, (pats, match, test) in tests.items():
+            if not pats:
+                continue
+
+            start = time.perf_counter()
+            for k in keys:
+                test(k)
+            elapsed = time.perf_counter() - start
+
+            counts = {p: {"enter": 0, "exit": 0, "overlap": 0} for p in pats}
+            for stage, matched in zip(("enter", "exit"), self._matched):
+                for key in matched:
+                    for c, p in hits[key]:
+                        if c != crit:
+                            continue
+                        counts[p][stage] += 1
+                        if len(hits[key]) > 1:
+                            counts[p]["overlap"] += 1
+
+            report[crit] = {"time": elapsed, "patterns": counts}
+
+        return report
+
+    def drain(self, stored=False):
+        """Yield and remove the retained temporary variables one at a time.
+
+        Each (name, value) pair is removed from :attr:`retained_tempvars`
+        before it is yielded, and the generator drops its own reference
+        before removing the next, so that a consumer that releases each
+        value in turn (e.g., after writing it to disk) never has the
+        whole set held twice::
+
+            >>> for name, val in tv.drain():
+            ...     save(name, val)
+
+        If `stored` is |True|, :attr:`stored_nsvars` is drained in the
+        same way afterward (inflating any compressed or spilled values).
+
+        """
+        sources = [self.retained_tempvars]
+        if stored:
+            sources.append(self.stored_nsvars)
+
+        for src in sources:
+            while src:
+                key = next(iter(src))
+                item = (key, src.pop(key))
+                yield item
+                del item
+
+    def _matches(self, key, val):
+        """Indicate whether `key`, bound to `val`, is to be treated as temp."""
+        if self._is_temp(key):
+            return True
+
+        test = self._value_test
+        if test is None or (key.startswith("__") and key.endswith("__")):
+            return False
+
+        if _is_ipython_name(key):
+            return False
+
+        return test(val)
+
+    def _pop_to(self, dest_dict, keep=frozenset()):
         """Pop matching namespace members to a storage dict.
 
         Namespace variables are popped over to `dest_dict` if
-        `test_fxn` is truthy when called with the variable
-        name as the first argument and any member of `patterns`
-        as the second argument.
+        their names (or values) match any of the compiled criteria and
+        are not in `keep`.
+
+        """
+        ns = self._ns
+
+        if self._value_test is None:
+            keys = [
+                k for k in list(ns) if k not in keep and self._is_temp(k)
+            ]
+        else:
+            keys = [
+                k
+                for k, v in list(ns.items())
+                if k not in keep and self._matches(k, v)
+            ]
+
+        if not self.local:
+            for key in keys:
+                val = ns.pop(key, _MISSING)
+                if val is not _MISSING:
+                    dest_dict[key] = val
+            return
+
+        for key in keys:
+            if ns[key] is not None:
+                dest_dict[key] = self._pop_local(key)
+
+    def _pop_local(self, key):
+        """Pop `key` from a frame-locals proxy namespace.
+
+        Fast locals cannot be removed through the proxy, and so are
+        instead rebound to |None|.
+
+        """
+        val = self._ns[key]
+        try:
+            del self._ns[key]
+        except (KeyError, TypeError, ValueError):
+            self._ns[key] = None
+        return val
+
+    def _pop_new_to(self, dest_dict, keep=frozenset()):
+        """Pop namespace members created since masking to a storage dict.
+
+        The new names are found by set difference against the key set
+        recorded on entry, without testing any patterns. Dunders, names in
+        `keep`, and any name bound to this instance are left in place.
+
+        """
+        ns = self._ns
+        for key in set(ns).difference(self._before, keep):
+            if key.startswith("__") and key.endswith("__"):
+                continue
+            if ns[key] is self or (self.local and ns[key] is None):
+                continue
+
+            dest_dict[key] = self._pop_key(key)
+
+    def _rollback_to(self, dest_dict, keep=frozenset()):
+        """Roll the namespace back to the snapshot taken on entry.
+
+        Variables created since the snapshot are popped to `dest_dict`;
+        variables rebound since have their suite values moved to
+        `dest_dict` and their snapshot values rebound; variables deleted
+        since are rebound. Names in `keep`, dunders, and any name bound to
+        this instance are left alone.
+
+        Rebinding is detected by identity, so a value mutated in place
+        is not rolled back.
 
         """
-        for key in list(self._ns.keys()):
-            if any(map(lambda p, k=key, t=test_fxn: t(k, p), patterns)):
-                dest_dict.update({key: self._ns.pop(key)})
+        ns, snap = self._ns, self._snapshot
+
+        for key in set(ns).difference(snap, keep):
+            if key.startswith("__") and key.endswith("__"):
+                continue
+            if ns[key] is self:
+                continue
+
+            dest_dict[key] = self._pop_key(key)
+
+        for key, val in snap.items():
+            cur = ns.get(key, _MISSING)
+            if cur is val or cur is self or key in keep:
+                continue
+
+            if cur is not _MISSING:
+                dest_dict[key] = cur
+            ns[key] = val
+
+    def _pop_key(self, key):
+        """Pop `key` from the namespace, whether a dict or locals proxy."""
+        if self.local:
+            return self._pop_local(key)
+        return self._ns.pop(key)
+
+    def _mask(self):
+        """Reset the stored state and mask matching namespace members."""
+        with self._lock:
+            if self._active:
+                raise RuntimeError("TempVars instance is already active")
+
+            self._active = True
+            self.stored_nsvars.clear()
+            self.stored_nsvars.stats.clear()
+            self.retained_tempvars.clear()
+
+            self._pop_to(self.stored_nsvars)
+            self._matched = (tuple(self.stored_nsvars), ())
+
+            if self.compress is not None:
+                self.stored_nsvars.compress_large(
+                    self.compress, self.compress_level, self.compress_threshold
+                )
+
+            if self.auto:
+                self._before = set(self._ns)
+
+            if self.rollback:
+                self._snapshot = dict(self._ns)
+
+            if self._gc_guard is not None:
+                self._gc_guard.enter()
+
+            if self._budget is not None:
+                self._budget.start()
+
+    def _scrub(self):
+        """Discard matching namespace members and restore, if indicated."""
+        with self._lock:
+            self._active = False
+
+            keep = frozenset(self.export or ())
+
+            scrubbed = {}
+            self._pop_to(scrubbed, keep)
+            self._matched = (self._matched[0], tuple(scrubbed))
+
+            if self.auto:
+                self._pop_new_to(scrubbed, keep)
+                self._before = None
+
+            if self.rollback:
+                self._rollback_to(scrubbed, keep)
+                self._snapshot = None
+
+            discarded = list(scrubbed.items())
+
+            if self.retain:
+                self.retained_tempvars.update(scrubbed)
+
+            if self.restore:
+                if self.compress is not None or self.max_rss is not None:
+                    self.stored_nsvars.inflate_all()
+
+                restored = self.stored_nsvars
+                if keep:
+                    restored = {
+                        k: v
+                        for k, v in restored.items()
+                        if k not in keep or k not in self._ns
+                    }
+                if self.local:
+                    for k, v in restored.items():
+                        self._ns[k] = v
+                else:
+                    self._ns.update(restored)
+            else:
+                discarded.extend(dict.items(self.stored_nsvars))
+                if not self.retain:
+                    self.stored_nsvars.clear()
+
+            # Exports to shared memory or disk come after the namespace is
+            # restored, so that an I/O error cannot lose the masked values
+            try:
+                if self.share:
+                    from .sharing import SharedExport
+
+                    # Unlink the blocks of the prior exit before
+                    # replacing them, so that re-entry does not leak them
+                    if self.shared is not None:
+                        self.shared.release()
+
+                    self.shared = SharedExport()
+                    for name, val in scrubbed.items():
+                        self.shared.add(name, val)
+
+                if self.persist is not None:
+                    from .persist import DiskStore
+
+                    self.persisted = DiskStore(self.persist).save(
+                        self.label, scrubbed
+                    )
+            finally:
+                if self.purge_outputs:
+                    from .ipython import purge_output_cache
+
+                    purge_output_cache(self._ns, [v for _, v in discarded])
+
+                if self.track_leaks:
+                    from .leaks import LeakChecker
+
+                    self.leaks = LeakChecker(ns=self._ns)
+                    self.leaks.track_all(discarded)
+
+                if self.release_async and not self.retain:
+                    from .releaser import default_releaser
+
+                    objs = [v for _, v in discarded]
+                    del scrubbed, discarded
+                    default_releaser().submit(objs)
+
+    def _memo_lookup(self, frame):
+        """Rebind cached exports if the inputs match a prior run.
+
+        `frame` is that of the |with| statement, whose location and code
+        key the cache along with the input fingerprints.
+
+        """
+        from .memo import code_fingerprint, default_cache, fingerprint
+
+        self.hit = False
+        self._memo_key = None
+
+        with self._lock:
+            prints = []
+            for name in self.inputs:
+                val = self._ns.get(name, _MISSING)
+                fp = None if val is _MISSING else fingerprint(val)
+                if fp is None and val is not _MISSING:
+                    # Unfingerprintable input: never memoize
+                    return
+                prints.append((name, fp))
+
+            # The code digest tells apart suites compiled under the same
+            # file name, e.g. two '<string>' cells
+            self._memo_key = (
+                frame.f_code.co_filename,
+                frame.f_lineno,
+                code_fingerprint(frame.f_code),
+                tuple(self.export or ()),
+                tuple(prints),
+            )
+
+            cached = default_cache().get(self._memo_key)
+            if cached is not None:
+                self._ns.update(cached)
+                self.hit = True
+
+    def _memo_store(self):
+        """Cache the exports bound by the suite, after a cache miss."""
+        from .memo import default_cache
+
+        key, self._memo_key = self._memo_key, None
+        if self.hit:
+            return
+
+        with self._lock:
+            exports = {
+                k: self._ns[k] for k in self.export or () if k in self._ns
+            }
+
+        default_cache().put(key, exports)
+
+    def _close(self):
+        """Stop the RSS monitor (if still running), scrub, then collect.
+
+        A :exc:`~tempvars.budget.MemoryBudgetExceeded` delivered to the
+        suite by the RSS monitor thread arrives without its message; if
+        one is being handled, it is re-raised here in full.
+
+        """
+        try:
+            if self._budget is not None:
+                self._budget.stop()
+        finally:
+            try:
+                self._scrub()
+            finally:
+                # Discarded values are released by now
+                if self._gc_guard is not None:
+                    self._gc_guard.exit()
+                    self.gc_stats = self._gc_guard.stats
+
+        if self._budget is not None and self._budget.error is not None:
+            import sys
+
+            from .budget import MemoryBudgetExceeded
+
+            exc = sys.exc_info()[1]
+            if type(exc) is MemoryBudgetExceeded and not exc.args:
+                raise self._budget.error.with_traceback(
+                    exc.__traceback__
+                ) from None
 
     def __enter__(self):
         """Context manager entry function.
@@ -209,13 +1282,18 @@ class TempVars(object):
         criteria provided in `names`/`starts`/`ends` and stores
         them in `self.stored_nsvars` for later reference.
 
+        The instance may be re-entered after each exit; any contents
+        of `self.stored_nsvars` and `self.retained_tempvars` from the
+        prior use are cleared upon re-entry.
+
         """
-        patterns = (self.names, self.starts, self.ends)
-        funcs = (str.__eq__, str.startswith, str.endswith)
+        self._compile_patterns()
+        self._mask()
+
+        if self.inputs is not None:
+            import sys
 
-        for p, f in zip(patterns, funcs):
-            if p is not None:
-                self._pop_to(self.stored_nsvars, p, f)
+            self._memo_lookup(sys._getframe(1))
 
         # Return instance so that users can inspect/modify it if desired
         return self
@@ -231,19 +1309,44 @@ class TempVars(object):
         context must handle all errors.
 
         """
-        patterns = (self.names, self.starts, self.ends)
-        funcs = (str.__eq__, str.startswith, str.endswith)
-
-        for p, f in zip(patterns, funcs):
-            if p is not None:
-                self._pop_to(self.retained_tempvars, p, f)
+        # The RSS monitor can raise asynchronously until stopped, so it
+        # is stopped first, and the scrub runs whatever happens meanwhile
+        try:
+            if self._budget is not None:
+                self._budget.stop()
 
-        if self.restore:
-            self._ns.update(self.stored_nsvars)
+            if self._memo_key is not None and exc_type is None:
+                self._memo_store()
+        finally:
+            self._close()
 
         # Containing code should handle any exception raised
         return False
 
+    def iterate(self, iterable):
+        """Iterate over `iterable`, managing a separate scope per item.
+
+        Each item is yielded from inside a fresh masking scope, which is
+        closed before the next item is drawn (or when the loop ends or is
+        broken out of)::
+
+            >>> for t_x in tv.iterate(data):
+            ...     t_y = t_x + 1
+
+        The patterns are compiled once for the whole loop, and the
+        instance's storage dicts are cleared (not reallocated) at the
+        start of each iteration.
+
+        """
+        self._compile_patterns()
+
+        for item in iterable:
+            self._mask()
+            try:
+                yield item
+            finally:
+                self._close()
+
 
 if __name__ == "__main__":  # pragma: no cover
     print("Module not executable.")
@@ -24,8 +24,28 @@ Jupyter Notebook, IPython, etc.
 """
 
 import doctest as dt
+import importlib.util
+import os
+import sys
 import unittest as ut
 
+# PEP 667 write-through frame locals (Python 3.13+)
+HAS_LOCALS_PROXY = sys.version_info >= (3, 13)
+
+# Pickle protocol 5 and multiprocessing.shared_memory (Python 3.8+)
+HAS_PICKLE5 = sys.version_info >= (3, 8)
+
+# gc.freeze() (Python 3.7+)
+HAS_GC_FREEZE = sys.version_info >= (3, 7)
+
+# Process RSS readable for memory budgets (Linux)
+HAS_STATM = os.path.exists("/proc/self/statm")
+
+# PEP 734 subinterpreters (Python 3.14+)
+HAS_SUBINTERPRETERS = (
+    importlib.util.find_spec("concurrent.interpreters") is not None
+)
+
 
 class SuperTestTempVars(object):
     """Superclass for temp vars testing."""
@@ -642,11 +662,1484 @@ class TestTempVarsExpectGood(SuperTestTempVars, ut.TestCase):
             "ret_tempvars_len_one = len(tv.retained_tempvars) == 1\n"
         )
 
+    def test_Good_ReentrySequential(self):
+        """Confirm an instance can be re-entered, with state reset."""
+        # Ensure self.d is actually getting cleared/reset
+        assert len(self.d) == 0
+
+        exec(
+            "from tempvars import TempVars\n"
+            "t_x = 5\n"
+            "tv = TempVars(starts=['t_'])\n"
+            "with tv:\n"
+            "    t_y = 12\n"
+            "nsvars_first = tv.stored_nsvars\n"
+            "_t_first_retained = tv.retained_tempvars == {'t_y': 12}\n"
+            "with tv:\n"
+            "    _t_inside_t_x_absent = 't_x' not in dir()\n"
+            "    t_z = 18\n"
+            "_t_same_dict = tv.stored_nsvars is nsvars_first\n"
+            "_t_second_stored = tv.stored_nsvars == {'t_x': 5}\n"
+            "_t_second_retained = tv.retained_tempvars == {'t_z': 18}\n"
+            "_t_outside_t_x_present = t_x == 5\n",
+            self.d,
+        )
+
+        for _ in [__ for __ in self.d if __.startswith("_t_")]:
+            self.locals_subTest(_, self.d, True)
+
+    def test_Good_IterateScopesEachItem(self):
+        """Confirm `iterate` opens and closes a scope around each item."""
+        # Ensure self.d is actually getting cleared/reset
+        assert len(self.d) == 0
+
+        exec(
+            "from tempvars import TempVars\n"
+            "t_x = 5\n"
+            "seen = []\n"
+            "tv = TempVars(starts=['t_'])\n"
+            "for t_i in tv.iterate(range(3)):\n"
+            "    seen.append('t_x' in dir() or 't_y' in dir())\n"
+            "    t_y = t_i * 2\n"
+            "_t_never_visible = seen == [False, False, False]\n"
+            "_t_last_retained = tv.retained_tempvars == {'t_i': 2, 't_y': 4}\n"
+            "_t_t_x_restored = t_x == 5\n"
+            "_t_t_i_absent = 't_i' not in dir()\n",
+            self.d,
+        )
+
+        for _ in [__ for __ in self.d if __.startswith("_t_")]:
+            self.locals_subTest(_, self.d, True)
+
+    def test_Good_IterateBreakClosesScope(self):
+        """Confirm breaking out of `iterate` still closes the scope."""
+        # Ensure self.d is actually getting cleared/reset
+        assert len(self.d) == 0
+
+        exec(
+            "from tempvars import TempVars\n"
+            "t_x = 5\n"
+            "tv = TempVars(starts=['t_'])\n"
+            "for t_i in tv.iterate(range(3)):\n"
+            "    break\n"
+            "_t_t_x_restored = t_x == 5\n"
+            "_t_t_i_absent = 't_i' not in dir()\n"
+            "with tv:\n"
+            "    _t_reentry_ok = 't_x' not in dir()\n",
+            self.d,
+        )
+
+        for _ in [__ for __ in self.d if __.startswith("_t_")]:
+            self.locals_subTest(_, self.d, True)
+
+    def test_Good_ExplicitNamespace(self):
+        """Confirm a namespace passed as `ns` is managed from any scope."""
+        from tempvars import TempVars
+
+        self.d.update({"t_x": 5, "y": 8})
+
+        with TempVars(starts=["t_"], ns=self.d) as tv:
+            with self.subTest("inside_t_x_absent"):
+                self.assertNotIn("t_x", self.d)
+            self.d["t_y"] = 12
+
+        with self.subTest("outside_t_x_restored"):
+            self.assertEqual(self.d, {"t_x": 5, "y": 8})
+        with self.subTest("outside_t_y_retained"):
+            self.assertEqual(tv.retained_tempvars, {"t_y": 12})
+
+    def test_Good_IPython_AssignedNames(self):
+        """Confirm binding names are collected from cell source."""
+        from tempvars.ipython import assigned_names
+
+        src = (
+            "import os.path, numpy as np\n"
+            "from sys import argv as t_argv\n"
+            "t_a, (t_b, c) = 1, (2, 3)\n"
+            "d = t_e = 4\n"
+            "for t_i in range(3): t_f += t_i\n"
+            "del g\n"
+            "def fn(t_arg):\n"
+            "    global t_h\n"
+            "with open('x') as t_fh: pass\n"
+            "try: pass\n"
+            "except Exception as t_err: pass\n"
+            "print(t_unbound)\n"
+        )
+
+        self.assertEqual(
+            assigned_names(src),
+            {
+                "os",
+                "np",
+                "t_argv",
+                "t_a",
+                "t_b",
+                "c",
+                "d",
+                "t_e",
+                "t_i",
+                "t_f",
+                "g",
+                "fn",
+                "t_h",
+                "t_fh",
+                "t_err",
+            },
+        )
+
+        with self.subTest("syntax_error"):
+            self.assertEqual(assigned_names("t_x = ("), set())
+
+        with self.subTest("magics"):
+            src = (
+                "get_ipython().run_line_magic('time', 't_c = 3')\n"
+                "get_ipython().run_cell_magic('time', '', 't_d = 4\\n')\n"
+                "get_ipython().run_cell_magic('capture', 't_out', 'x=1')\n"
+                "get_ipython().run_line_magic('env', 'y=2')\n"
+            )
+            self.assertEqual(
+                assigned_names(src), {"t_c", "t_d", "t_out", "x"}
+            )
+
+    def test_Good_IPython_AutoCleanerCell(self):
+        """Confirm only matching names bound by the cell are discarded."""
+        from types import SimpleNamespace as SN
+
+        from tempvars import TempVars
+        from tempvars.ipython import AutoCleaner
+
+        self.d.update({"t_old": 1, "keep": 2})
+        shell = SN(user_ns=self.d, transform_cell=lambda s: s)
+        cleaner = AutoCleaner(
+            shell=shell, tempvars=TempVars(starts=["t_"], ns=self.d)
+        )
+
+        src = "t_new = keep + 1\nresult = t_new\n"
+        cleaner.pre_run_cell(SN(raw_cell=src))
+        exec(src, self.d)
+        cleaner.post_run_cell(None)
+
+        with self.subTest("t_new_discarded"):
+            self.assertNotIn("t_new", self.d)
+        with self.subTest("result_kept"):
+            self.assertEqual(self.d["result"], 3)
+        with self.subTest("untouched_temp_left"):
+            self.assertEqual(self.d["t_old"], 1)
+
+    def test_Good_IPython_PurgeOutputs(self):
+        """Confirm output-history references to discarded values go away."""
+        from tempvars import TempVars
+
+        big, other = [1] * 10, [2] * 10
+        self.d.update(
+            {
+                "Out": {3: big, 4: other},
+                "_3": big,
+                "_4": other,
+                "_": big,
+                "__": other,
+                "___": "",
+            }
+        )
+
+        with TempVars(starts=["t_"], purge_outputs=True, ns=self.d):
+            self.d["t_big"] = big
+
+        with self.subTest("Out_purged"):
+            self.assertEqual(list(self.d["Out"]), [4])
+        with self.subTest("_N_purged"):
+            self.assertNotIn("_3", self.d)
+        with self.subTest("_N_other_kept"):
+            self.assertIs(self.d["_4"], other)
+        with self.subTest("underscore_reset"):
+            self.assertEqual(self.d["_"], "")
+        with self.subTest("dunder_kept"):
+            self.assertIs(self.d["__"], other)
+
+    def test_Good_IPython_PurgeSkipsAtoms(self):
+        """Confirm cached or interned immutable outputs are not purged."""
+        from tempvars import TempVars
+
+        self.d.update({"Out": {1: 5, 2: "abc", 3: (1, "a")}, "_": 5})
+
+        with TempVars(starts=["t_"], purge_outputs=True, ns=self.d):
+            self.d["t_n"] = 5
+            self.d["t_s"] = "abc"
+            self.d["t_tup"] = self.d["Out"][3]
+
+        with self.subTest("Out_kept"):
+            self.assertEqual(list(self.d["Out"]), [1, 2, 3])
+        with self.subTest("underscore_kept"):
+            self.assertEqual(self.d["_"], 5)
+
+        blob, text = b"x" * 100000, "some text " * 1000
+        self.d.update({"Out": {4: blob, 5: text}, "_": blob, "__": text})
+
+        with TempVars(starts=["t_"], purge_outputs=True, ns=self.d):
+            self.d["t_blob"] = blob
+            self.d["t_text"] = text
+
+        with self.subTest("large_evicted"):
+            self.assertEqual(self.d["Out"], {})
+            self.assertEqual(self.d["_"], "")
+            self.assertEqual(self.d["__"], "")
+
+    def test_Good_NoRetain(self):
+        """Confirm `retain=False` keeps no references to discarded values."""
+        # Ensure self.d is actually getting cleared/reset
+        assert len(self.d) == 0
+
+        exec(
+            "from tempvars import TempVars\n"
+            "t_x = 5\n"
+            "with TempVars(starts=['t_'], retain=False,\n"
+            "              restore=False) as tv:\n"
+            "    _t_inside_stored = tv.stored_nsvars == {'t_x': 5}\n"
+            "    t_y = 12\n"
+            "_t_outside_t_y_absent = 't_y' not in dir()\n"
+            "_t_outside_retained_empty = len(tv.retained_tempvars) == 0\n"
+            "_t_outside_stored_empty = len(tv.stored_nsvars) == 0\n",
+            self.d,
+        )
+
+        for _ in [__ for __ in self.d if __.startswith("_t_")]:
+            self.locals_subTest(_, self.d, True)
+
+    def test_Good_TrackLeaks(self):
+        """Confirm surviving discarded values are reported with a chain."""
+        # Ensure self.d is actually getting cleared/reset
+        assert len(self.d) == 0
+
+        exec(
+            "from tempvars import TempVars\n"
+            "class Thing(object):\n"
+            "    pass\n"
+            "keeper = []\n"
+            "with TempVars(starts=['t_'], retain=False, restore=False,\n"
+            "              track_leaks=True) as tv:\n"
+            "    t_kept = Thing()\n"
+            "    t_freed = Thing()\n"
+            "    t_list = [1, 2]\n"
+            "    keeper.append(t_kept)\n"
+            "_t_alive = tv.leaks.alive() == ['t_kept']\n"
+            "_t_untracked = tv.leaks.untracked == ['t_list']\n"
+            "_t_chain = tv.leaks.report() == {\n"
+            "    't_kept': [\"dict['keeper']\", 'list[0]']\n"
+            "}\n",
+            self.d,
+        )
+
+        for _ in [__ for __ in self.d if __.startswith("_t_")]:
+            self.locals_subTest(_, self.d, True)
+
+    def test_Good_AutoMode(self):
+        """Confirm `auto` discards all new names except exports."""
+        # Ensure self.d is actually getting cleared/reset
+        assert len(self.d) == 0
+
+        exec(
+            "from tempvars import TempVars\n"
+            "x = 5\n"
+            "t_x = 6\n"
+            "with TempVars(auto=True, starts=['t_'],\n"
+            "              export=['result', '_t_inside_t_x_absent']) as tv:\n"
+            "    _t_inside_t_x_absent = 't_x' not in dir()\n"
+            "    y = x + 1\n"
+            "    result = y * 2\n"
+            "    x = 18\n"
+            "_t_inside_flag_exported = '_t_inside_t_x_absent' in dir()\n"
+            "_t_y_absent = 'y' not in dir()\n"
+            "_t_result_kept = result == 12\n"
+            "_t_x_rebound_kept = x == 18\n"
+            "_t_t_x_restored = t_x == 6\n"
+            "_t_tv_kept = isinstance(tv, TempVars)\n"
+            "_t_y_retained = tv.retained_tempvars == {'y': 6}\n",
+            self.d,
+        )
+
+        for _ in [__ for __ in self.d if __.startswith("_t_")]:
+            self.locals_subTest(_, self.d, True)
+
+    def test_Good_ExportOverridesPatterns(self):
+        """Confirm exported matching names survive exit, unrestored."""
+        # Ensure self.d is actually getting cleared/reset
+        assert len(self.d) == 0
+
+        exec(
+            "from tempvars import TempVars\n"
+            "t_x = 5\n"
+            "with TempVars(starts=['t_'], export=['t_x']) as tv:\n"
+            "    _t_inside_t_x_absent = 't_x' not in dir()\n"
+            "    t_x = 12\n"
+            "    t_y = 13\n"
+            "_t_t_x_exported = t_x == 12\n"
+            "_t_t_y_absent = 't_y' not in dir()\n",
+            self.d,
+        )
+
+        for _ in [__ for __ in self.d if __.startswith("_t_")]:
+            self.locals_subTest(_, self.d, True)
+
+    def test_Good_PositionalArgs(self):
+        """Confirm the original positional argument order still holds."""
+        from tempvars import TempVars
+
+        tv = TempVars(["a"], ["t_"], ["_x"], False, ns=self.d)
+
+        with self.subTest("names"):
+            self.assertEqual(tv.names, ["a"])
+        with self.subTest("starts"):
+            self.assertEqual(tv.starts, ["t_"])
+        with self.subTest("ends"):
+            self.assertEqual(tv.ends, ["_x"])
+        with self.subTest("restore"):
+            self.assertFalse(tv.restore)
+
+        tv = TempVars(["a"], None, None, False, ns=self.d)
+        with self.subTest("restore_after_none"):
+            self.assertFalse(tv.restore)
+
+    @ut.skipUnless(HAS_PICKLE5, "Requires Python 3.8+")
+    def test_Good_ShareBuffers(self):
+        """Confirm buffer-backed temporaries are exported to shared memory."""
+        from array import array
+
+        from tempvars import TempVars
+        from tempvars.sharing import attach
+
+        with TempVars(starts=["t_"], share=True, ns=self.d) as tv:
+            self.d["t_bytes"] = b"abcdef"
+            self.d["t_arr"] = array("d", [1.5, 2.5, 3.5])
+            self.d["t_list"] = [1, 2, 3]
+
+        try:
+            with self.subTest("table_keys"):
+                self.assertEqual(set(tv.shared.table), {"t_bytes", "t_arr"})
+
+            shm, val = attach(tv.shared.table["t_arr"])
+            with self.subTest("array_roundtrip"):
+                self.assertEqual(val.tolist(), [1.5, 2.5, 3.5])
+            val.release()
+            shm.close()
+
+            shm, val = attach(tv.shared.table["t_bytes"])
+            with self.subTest("bytes_roundtrip"):
+                self.assertEqual(val.tobytes(), b"abcdef")
+            val.release()
+            shm.close()
+        finally:
+            tv.shared.release()
+
+    @ut.skipUnless(HAS_PICKLE5, "Requires Python 3.8+")
+    def test_Good_ShareReentryReleases(self):
+        """Confirm re-entry releases the blocks shared at the prior exit."""
+        from tempvars import TempVars
+        from tempvars.sharing import attach
+
+        tv = TempVars(starts=["t_"], share=True, ns=self.d)
+
+        with tv:
+            self.d["t_bytes"] = b"abc"
+        first = dict(tv.shared.table["t_bytes"])
+
+        try:
+            with tv:
+                self.d["t_bytes"] = b"def"
+
+            with self.subTest("old_released"):
+                self.assertRaises(FileNotFoundError, attach, first)
+
+            shm, val = attach(tv.shared.table["t_bytes"])
+            with self.subTest("new_exported"):
+                self.assertEqual(val.tobytes(), b"def")
+            val.release()
+            shm.close()
+        finally:
+            tv.shared.release()
+
+    @ut.skipUnless(HAS_PICKLE5, "Requires Python 3.8+")
+    def test_Good_CompressMasked(self):
+        """Confirm large masked values are held compressed and restored."""
+        from tempvars import TempVars
+        from tempvars.compression import CompressedValue
+
+        big = b"abcd" * 50000
+        # Only values held by nothing else are compressed
+        self.d.update({"t_big": b"abcd" * 50000, "t_small": b"ab"})
+
+        for method in ["zlib", "lzma"]:
+            with self.subTest(method):
+                with TempVars(
+                    starts=["t_"],
+                    compress=method,
+                    compress_threshold=1000,
+                    ns=self.d,
+                ) as tv:
+                    raw = dict(dict.items(tv.stored_nsvars))
+                    self.assertIsInstance(raw["t_big"], CompressedValue)
+                    self.assertEqual(raw["t_small"], b"ab")
+                    self.assertLess(
+                        tv.stored_nsvars.stats["stored_bytes"],
+                        tv.stored_nsvars.stats["raw_bytes"],
+                    )
+                    self.assertIn("compress_time", tv.stored_nsvars.stats)
+
+                self.assertEqual(self.d["t_big"], big)
+                self.assertEqual(self.d["t_small"], b"ab")
+                self.assertIn("decompress_time", tv.stored_nsvars.stats)
+
+                # The retained copy would otherwise alias the next value
+                del tv, raw
+
+    @ut.skipUnless(HAS_PICKLE5, "Requires Python 3.8+")
+    def test_Good_CompressLazyAccess(self):
+        """Confirm compressed values inflate on access via `stored_nsvars`."""
+        from tempvars import TempVars
+        from tempvars.compression import CompressedValue
+
+        big = list(range(100000))
+        self.d["t_big"] = list(big)
+
+        with TempVars(
+            starts=["t_"],
+            restore=False,
+            compress="zlib",
+            compress_threshold=1000,
+            ns=self.d,
+        ) as tv:
+            pass
+
+        self.assertIsInstance(
+            dict.__getitem__(tv.stored_nsvars, "t_big"), CompressedValue
+        )
+        self.assertEqual(tv.stored_nsvars.get("t_big"), big)
+        self.assertEqual(dict.__getitem__(tv.stored_nsvars, "t_big"), big)
+
+    @ut.skipUnless(HAS_PICKLE5, "Requires Python 3.8+")
+    def test_Good_CompressSkipsAliased(self):
+        """Confirm values referenced elsewhere are not compressed."""
+        from tempvars import TempVars
+
+        exec(
+            "from tempvars import TempVars\n"
+            "t_data = list(range(100000))\n"
+            "alias = t_data\n"
+            "with TempVars(starts=['t_'], compress='zlib',\n"
+            "              compress_threshold=1000) as tv:\n"
+            "    alias.append(-1)\n",
+            self.d,
+        )
+
+        with self.subTest("identity"):
+            self.assertIs(self.d["t_data"], self.d["alias"])
+        with self.subTest("mutation_kept"):
+            self.assertEqual(self.d["t_data"][-1], -1)
+        with self.subTest("not_compressed"):
+            stats = self.d["tv"].stored_nsvars.stats
+            self.assertEqual(stats.get("raw_bytes", 0), 0)
+
+        self.assertIsInstance(self.d["tv"], TempVars)
+
+    def test_Good_containsPassed(self):
+        """Confirm vars containing `contains` patterns are masked."""
+        # Ensure self.d is actually getting cleared/reset
+        assert len(self.d) == 0
+
+        exec(
+            "from tempvars import TempVars\n"
+            "a_tmp_x = 5\n"
+            "b_scratch = 8\n"
+            "z_x = 14\n"
+            "with TempVars(contains=['_tmp_', 'scratch', 'uiltin']) as tv:\n"
+            "    _t_inside_a_absent = 'a_tmp_x' not in dir()\n"
+            "    _t_inside_b_absent = 'b_scratch' not in dir()\n"
+            "    _t_inside_z_x_present = 'z_x' in dir()\n"
+            "    _t_inside_dunder_present = '__builtins__' in dir()\n"
+            "    c_tmp_y = 3\n"
+            "_t_outside_a_present = a_tmp_x == 5\n"
+            "_t_outside_b_present = b_scratch == 8\n"
+            "_t_outside_c_absent = 'c_tmp_y' not in dir()\n"
+            "_t_outside_retained = tv.retained_tempvars == {'c_tmp_y': 3}\n",
+            self.d,
+        )
+
+        for _ in [__ for __ in self.d if __.startswith("_t_")]:
+            self.locals_subTest(_, self.d, True)
+
+    def test_Good_SweeperPass(self):
+        """Confirm a sweep pops matching globals into a bounded store."""
+        from tempvars import TempVars
+        from tempvars.sweeper import Sweeper
+
+        self.d.update(
+            {"t_a": b"a" * 1000, "t_b": b"b" * 1000, "t_keep": 1, "x": 2}
+        )
+        sw = Sweeper(
+            TempVars(starts=["t_"], export=["t_keep"], ns=self.d),
+            max_bytes=1500,
+            slice_time=0.0,
+        )
+
+        swept = sw.sweep()
+
+        with self.subTest("swept"):
+            self.assertEqual(sorted(swept), ["t_a", "t_b"])
+        with self.subTest("namespace"):
+            self.assertEqual(self.d, {"t_keep": 1, "x": 2})
+        with self.subTest("oldest_evicted"):
+            self.assertEqual(list(sw.store), ["t_b"])
+        with self.subTest("store_bytes"):
+            self.assertLessEqual(sw.store_bytes, 1500)
+        with self.subTest("recover"):
+            self.assertEqual(sw.recover("t_b"), b"b" * 1000)
+            self.assertEqual(sw.store_bytes, 0)
+
+    def test_Good_SweeperBackground(self):
+        """Confirm the background thread sweeps and stops."""
+        import time
+
+        from tempvars import TempVars
+        from tempvars.sweeper import Sweeper
+
+        self.d["t_a"] = 1
+        sw = Sweeper(TempVars(starts=["t_"], ns=self.d), interval=0.01)
+        sw.start()
+        try:
+            deadline = time.time() + 5
+            while "t_a" in self.d and time.time() < deadline:
+                time.sleep(0.01)
+        finally:
+            sw.stop()
+
+        self.assertNotIn("t_a", self.d)
+        self.assertIn("t_a", sw.store)
+
+    def test_Good_IsolatedSeedFinish(self):
+        """Confirm isolated-suite seeding and merging follow masking."""
+        from tempvars import TempVars
+        from tempvars.isolated import IsolatedSuite
+
+        self.d.update({"data": [1, 2], "t_x": 5, "t_y": 6})
+        suite = IsolatedSuite(
+            TempVars(starts=["t_"], restore=False, ns=self.d),
+            "",
+            imports=["data", "t_x", "missing"],
+            exports=["result", "t_z"],
+        )
+
+        with self.subTest("seed"):
+            self.assertEqual(suite.seed(), {"data": [1, 2]})
+
+        suite.finish({"result": 3, "t_z": 4})
+
+        with self.subTest("namespace"):
+            self.assertEqual(self.d, {"data": [1, 2], "result": 3})
+        with self.subTest("retained"):
+            self.assertEqual(suite.tempvars.retained_tempvars, {"t_z": 4})
+        with self.subTest("stored"):
+            self.assertEqual(
+                dict(suite.tempvars.stored_nsvars), {"t_x": 5, "t_y": 6}
+            )
+
+    @ut.skipUnless(HAS_SUBINTERPRETERS, "Subinterpreters not available")
+    def test_Good_IsolatedRun(self):  # pragma: no cover
+        """Confirm suites run in subinterpreters and return exports."""
+        from tempvars import TempVars
+        from tempvars.isolated import IsolatedSuite
+
+        self.d.update({"data": [1, 2, 3], "t_x": 5})
+        suites = [
+            IsolatedSuite(
+                TempVars(starts=["t_"], ns=self.d),
+                "t_s = sum(data)\nres_{0} = t_s * {0}\n".format(i),
+                imports=["data"],
+                exports=["res_{0}".format(i), "t_s"],
+            )
+            for i in range(3)
+        ]
+        for s in suites:
+            s.start()
+        for s in suites:
+            s.join()
+
+        self.assertEqual(
+            self.d,
+            {"data": [1, 2, 3], "t_x": 5, "res_0": 0, "res_1": 6, "res_2": 12},
+        )
+
+    @ut.skipUnless(HAS_LOCALS_PROXY, "Requires PEP 667 frame locals")
+    def test_Good_LocalScope(self):  # pragma: no cover
+        """Confirm function locals are masked, scrubbed and restored."""
+        from tempvars import TempVars
+
+        def fn():
+            t_x = 5
+            y = 8
+            tv = TempVars(starts=["t_"], local=True)
+            seen = []
+
+            for i in range(3):
+                with tv:
+                    seen.append(t_x)
+                    t_z = y + i
+
+            return t_x, t_z, seen, tv.retained_tempvars
+
+        t_x, t_z, seen, retained = fn()
+
+        with self.subTest("t_x_restored"):
+            self.assertEqual(t_x, 5)
+        with self.subTest("t_z_scrubbed"):
+            self.assertIsNone(t_z)
+        with self.subTest("t_x_masked_inside"):
+            self.assertEqual(seen, [None, None, None])
+        with self.subTest("retained"):
+            self.assertEqual(retained, {"t_z": 10})
+
+    def test_Good_ReleaseAsync(self):
+        """Confirm discarded values are released on the background thread."""
+        import threading
+        import weakref
+
+        from tempvars import TempVars
+        from tempvars.releaser import default_releaser
+
+        class Thing(object):
+            def __del__(self):
+                freed.append(threading.current_thread().name)
+
+        freed = []
+        self.d["t_x"] = Thing()
+
+        with TempVars(
+            starts=["t_"],
+            retain=False,
+            restore=False,
+            release_async=True,
+            track_leaks=True,
+            ns=self.d,
+        ):
+            self.d["t_y"] = Thing()
+            ref = weakref.ref(self.d["t_y"])
+
+        default_releaser().flush()
+
+        with self.subTest("freed"):
+            self.assertIsNone(ref())
+        with self.subTest("on_releaser_thread"):
+            self.assertEqual(freed, ["tempvars-releaser"] * 2)
+        with self.subTest("deferred_bytes"):
+            self.assertEqual(default_releaser().deferred_bytes, 0)
+
+    def test_Good_Rollback(self):
+        """Confirm created, rebound and deleted names are rolled back."""
+        # Ensure self.d is actually getting cleared/reset
+        assert len(self.d) == 0
+
+        exec(
+            "from tempvars import TempVars\n"
+            "a = [1]\n"
+            "b = 2\n"
+            "c = 3\n"
+            "with TempVars(rollback=True, export=['out']) as tv:\n"
+            "    a = 'rebound'\n"
+            "    del b\n"
+            "    new = 4\n"
+            "    out = 5\n"
+            "    c += 1\n"
+            "_t_a_restored = a == [1]\n"
+            "_t_b_restored = b == 2\n"
+            "_t_c_restored = c == 3\n"
+            "_t_new_absent = 'new' not in dir()\n"
+            "_t_out_exported = out == 5\n"
+            "_t_tv_kept = isinstance(tv, TempVars)\n"
+            "_t_retained = tv.retained_tempvars == \\\n"
+            "    {'a': 'rebound', 'new': 4, 'c': 4}\n",
+            self.d,
+        )
+
+        for _ in [__ for __ in self.d if __.startswith("_t_")]:
+            self.locals_subTest(_, self.d, True)
+
+    def test_Good_RollbackWithMasking(self):
+        """Confirm masked names follow `restore` under rollback."""
+        # Ensure self.d is actually getting cleared/reset
+        assert len(self.d) == 0
+
+        exec(
+            "from tempvars import TempVars\n"
+            "t_x = 1\n"
+            "y = 2\n"
+            "with TempVars(starts=['t_'], rollback=True,\n"
+            "              restore=False) as tv:\n"
+            "    t_x = 5\n"
+            "    y = 6\n"
+            "_t_t_x_absent = 't_x' not in dir()\n"
+            "_t_y_restored = y == 2\n",
+            self.d,
+        )
+
+        for _ in [__ for __ in self.d if __.startswith("_t_")]:
+            self.locals_subTest(_, self.d, True)
+
+    def test_Good_ThreadsSharedNamespace(self):
+        """Confirm concurrent instances on one namespace stay consistent."""
+        import threading
+
+        from tempvars import TempVars
+
+        n_threads, n_iter = 8, 200
+        errors = []
+        stop = threading.Event()
+
+        for i in range(n_threads):
+            self.d["t{0}_x".format(i)] = i
+
+        def work(i):
+            name = "t{0}_x".format(i)
+            try:
+                for j in range(n_iter):
+                    with TempVars(starts=["t{0}_".format(i)], ns=self.d):
+                        if name in self.d:
+                            errors.append((i, j, "not masked"))
+                        self.d[name] = -j
+                    if self.d[name] != i:
+                        errors.append((i, j, "not restored"))
+            except Exception as e:  # pragma: no cover
+                errors.append((i, repr(e)))
+
+        def churn():
+            # Unrelated code binding and unbinding globals meanwhile
+            k = 0
+            while not stop.is_set():
+                self.d["churn{0}".format(k % 50)] = k
+                self.d.pop("churn{0}".format((k + 25) % 50), None)
+                k += 1
+
+        churner = threading.Thread(target=churn)
+        churner.start()
+        workers = [
+            threading.Thread(target=work, args=(i,)) for i in range(n_threads)
+        ]
+        for t in workers:
+            t.start()
+        for t in workers:
+            t.join()
+        stop.set()
+        churner.join()
+
+        self.assertEqual(errors, [])
+
+    def test_Good_NamespaceLocks(self):
+        """Confirm instances share locks per namespace, not across them."""
+        import threading
+
+        from tempvars import TempVars
+
+        tv1 = TempVars(starts=["t_"], ns=self.d)
+        tv2 = TempVars(ends=["_t"], ns=self.d)
+        tv3 = TempVars(starts=["t_"], ns={})
+
+        with self.subTest("same_ns"):
+            self.assertIs(tv1._lock, tv2._lock)
+        with self.subTest("other_ns"):
+            self.assertIsNot(tv1._lock, tv3._lock)
+        with self.subTest("other_ns_free"):
+            got = []
+
+            def try_lock(tv):
+                got.append(tv._lock.acquire(blocking=False))
+                if got[-1]:
+                    tv._lock.release()
+
+            with tv1._lock:
+                for tv in (tv2, tv3):
+                    t = threading.Thread(target=try_lock, args=(tv,))
+                    t.start()
+                    t.join()
+
+            self.assertEqual(got, [False, True])
+
+    @ut.skipUnless(HAS_PICKLE5, "Requires Python 3.8+")
+    def test_Good_PersistRoundTrip(self):
+        """Confirm discarded values are persisted and lazily reloaded."""
+        import os
+        import pickle
+        import tempfile
+
+        from tempvars import TempVars
+        from tempvars.persist import DiskStore, PersistedVars
+
+        with tempfile.TemporaryDirectory() as root:
+            self.d.update({"t_old": 1, "x": 2})
+
+            with TempVars(
+                starts=["t_"], persist=root, label="fit", ns=self.d
+            ) as tv:
+                self.d["t_list"] = [1, "two", 3.0]
+                self.d["t_buf"] = pickle.PickleBuffer(b"abc" * 1000)
+                self.d["t_func"] = lambda: None
+
+            store = DiskStore(root)
+            loaded = store.load("fit")
+
+            with self.subTest("persisted"):
+                self.assertEqual(sorted(tv.persisted), ["t_buf", "t_list"])
+            with self.subTest("labels"):
+                self.assertEqual(store.labels(), ["fit"])
+            with self.subTest("lazy"):
+                self.assertIsInstance(loaded, PersistedVars)
+                self.assertEqual(loaded._cache, {})
+            with self.subTest("values"):
+                self.assertEqual(loaded["t_list"], [1, "two", 3.0])
+                self.assertEqual(bytes(loaded["t_buf"]), b"abc" * 1000)
+            with self.subTest("out_of_band"):
+                entry = loaded._index["t_buf"]
+                self.assertEqual(len(entry["buffers"]), 1)
+                self.assertEqual(
+                    os.path.getsize(
+                        os.path.join(root, "fit", entry["buffers"][0])
+                    ),
+                    3000,
+                )
+            with self.subTest("replaced"):
+                store.save("fit", {"y": 3})
+                self.assertEqual(dict(store.load("fit")), {"y": 3})
+                self.assertEqual(os.listdir(root), ["fit"])
+            with self.subTest("delete"):
+                store.delete("fit")
+                self.assertRaises(KeyError, store.load, "fit")
+
+    @ut.skipUnless(HAS_PICKLE5, "Requires Python 3.8+")
+    def test_Good_PersistFailureRestores(self):
+        """Confirm masked values are restored even if persisting fails."""
+        import os
+        import tempfile
+
+        from tempvars import TempVars
+
+        with tempfile.TemporaryDirectory() as root:
+            notadir = os.path.join(root, "notadir")
+            with open(notadir, "w"):
+                pass
+
+            self.d.update({"t_old": 1, "x": 2})
+            tv = TempVars(
+                starts=["t_"],
+                persist=os.path.join(notadir, "store"),
+                label="fit",
+                ns=self.d,
+            )
+
+            with self.assertRaises(OSError):
+                with tv:
+                    self.d["t_new"] = 3
+
+            with self.subTest("restored"):
+                self.assertEqual(self.d, {"t_old": 1, "x": 2})
+            with self.subTest("retained"):
+                self.assertEqual(tv.retained_tempvars, {"t_new": 3})
+
+    def test_Good_MemoizedSuite(self):
+        """Confirm memoized suites rerun only when their inputs change."""
+        from tempvars.memo import default_cache
+
+        default_cache().clear()
+
+        exec(
+            "from tempvars import TempVars\n"
+            "runs = []\n"
+            "data = [1, 2, 3]\n"
+            "for i in range(4):\n"
+            "    if i == 2:\n"
+            "        data = [4, 5]\n"
+            "    with TempVars(starts=['t_'], inputs=['data'],\n"
+            "                  export=['memo_out']) as tv:\n"
+            "        if not tv.hit:\n"
+            "            runs.append(i)\n"
+            "            t_sum = sum(data)\n"
+            "            memo_out = t_sum * 2\n"
+            "    if i == 2:\n"
+            "        del memo_out\n",
+            self.d,
+        )
+
+        with self.subTest("runs"):
+            self.assertEqual(self.d["runs"], [0, 2])
+        with self.subTest("rebound"):
+            self.assertEqual(self.d["memo_out"], 18)
+        with self.subTest("temps_scrubbed"):
+            self.assertNotIn("t_sum", self.d)
+        with self.subTest("stats"):
+            self.assertEqual(
+                (default_cache().hits, default_cache().misses), (2, 2)
+            )
+
+    def test_Good_MemoFingerprints(self):
+        """Confirm fingerprints follow content, not identity."""
+        from tempvars.memo import fingerprint
+
+        with self.subTest("atoms"):
+            self.assertEqual(fingerprint((1, "a")), fingerprint((1, "a")))
+            self.assertNotEqual(fingerprint(1), fingerprint(1.0))
+        with self.subTest("buffer"):
+            a, b = bytearray(b"xyz"), bytearray(b"xyz")
+            self.assertEqual(fingerprint(a), fingerprint(b))
+            b[0] = 0
+            self.assertNotEqual(fingerprint(a), fingerprint(b))
+        with self.subTest("pickled"):
+            self.assertEqual(fingerprint({"a": [1]}), fingerprint({"a": [1]}))
+            self.assertNotEqual(
+                fingerprint({"a": [1]}), fingerprint({"a": [2]})
+            )
+        with self.subTest("pickled_before_protocol_5"):
+            import pickle
+
+            saved = pickle.HIGHEST_PROTOCOL
+            pickle.HIGHEST_PROTOCOL = 4
+            try:
+                fp = fingerprint({"a": [1]})
+                self.assertIsNotNone(fp)
+                self.assertEqual(fp, fingerprint({"a": [1]}))
+            finally:
+                pickle.HIGHEST_PROTOCOL = saved
+        with self.subTest("unpicklable"):
+            self.assertIsNone(fingerprint(x for x in ()))
+        with self.subTest("functions"):
+
+            def make(v, d=1):
+                return lambda x=d: x + v
+
+            self.assertEqual(fingerprint(make(1)), fingerprint(make(1)))
+            self.assertNotEqual(fingerprint(make(1)), fingerprint(make(2)))
+            self.assertNotEqual(
+                fingerprint(make(1)), fingerprint(make(1, d=2))
+            )
+        with self.subTest("classes"):
+            self.assertIsNone(fingerprint(dict))
+
+    def test_Good_MemoSameLineSuites(self):
+        """Confirm different suites on the same line do not share a key."""
+        from tempvars.memo import default_cache
+
+        default_cache().clear()
+        src = (
+            "from tempvars import TempVars\n"
+            "with TempVars(starts=['t_'], inputs=['data'],\n"
+            "              export=['out']) as tv:\n"
+            "    if not tv.hit:\n"
+            "        out = {0}\n"
+        )
+
+        self.d["data"] = 1
+        exec(src.format("'first'"), self.d)
+        exec(src.format("'second'"), self.d)
+
+        with self.subTest("miss"):
+            self.assertFalse(self.d["tv"].hit)
+        with self.subTest("value"):
+            self.assertEqual(self.d["out"], "second")
+
+        exec(src.format("'second'"), self.d)
+        with self.subTest("hit"):
+            self.assertTrue(self.d["tv"].hit)
+
+    def test_Good_MemoCacheBudget(self):
+        """Confirm the memo cache evicts least recently used entries."""
+        from tempvars.memo import MemoCache
+
+        cache = MemoCache(max_bytes=2500)
+        for k in "abc":
+            cache.put(k, {"v": b"x" * 1000})
+            cache.get("a")
+
+        with self.subTest("lru_evicted"):
+            self.assertEqual(list(cache.store), ["c", "a"])
+        with self.subTest("too_large"):
+            cache.put("d", {"v": b"x" * 3000})
+            self.assertIsNone(cache.get("d"))
+
+    def test_Good_Explain(self):
+        """Confirm per-pattern match counts and timings from explain()."""
+        from tempvars import TempVars
+
+        self.d.update({"t_a": 1, "t_a_tmp": 2, "x": 3})
+
+        with TempVars(
+            names=["x", "unused"],
+            starts=["t_"],
+            ends=["_tmp"],
+            ns=self.d,
+        ) as tv:
+            self.d["t_b"] = 4
+
+        patterns = tv._patterns
+        report = tv.explain()
+
+        with self.subTest("state_untouched"):
+            self.assertIs(tv._patterns, patterns)
+        with self.subTest("criteria"):
+            self.assertEqual(sorted(report), ["ends", "names", "starts"])
+        with self.subTest("names"):
+            self.assertEqual(
+                report["names"]["patterns"],
+                {
+                    "x": {"enter": 1, "exit": 0, "overlap": 0},
+                    "unused": {"enter": 0, "exit": 0, "overlap": 0},
+                },
+            )
+        with self.subTest("starts"):
+            self.assertEqual(
+                report["starts"]["patterns"],
+                {"t_": {"enter": 2, "exit": 1, "overlap": 1}},
+            )
+        with self.subTest("ends"):
+            self.assertEqual(
+                report["ends"]["patterns"],
+                {"_tmp": {"enter": 1, "exit": 0, "overlap": 1}},
+            )
+        with self.subTest("time"):
+            self.assertGreaterEqual(report["starts"]["time"], 0.0)
+
+    @ut.skipUnless(HAS_GC_FREEZE, "Requires Python 3.7+")
+    def test_Good_GCFreeze(self):
+        """Confirm GC freezing, threshold swap and collection on exit."""
+        import gc
+        import weakref
+
+        from tempvars import TempVars
+
+        class Node(object):
+            pass
+
+        thresh = gc.get_threshold()
+        self.d["t_old"] = [1]
+
+        with TempVars(
+            starts=["t_"],
+            retain=False,
+            restore=False,
+            gc_freeze=True,
+            gc_threshold=(50000, 50, 50),
+            ns=self.d,
+        ) as tv:
+            during = (gc.get_freeze_count(), gc.get_threshold())
+            node = Node()
+            node.self = node
+            self.d["t_cycle"] = node
+            ref = weakref.ref(node)
+            del node
+
+        with self.subTest("frozen_during"):
+            self.assertGreater(during[0], 0)
+            self.assertEqual(during[1], (50000, 50, 50))
+        with self.subTest("cycle_collected"):
+            self.assertIsNone(ref())
+            self.assertGreaterEqual(tv.gc_stats["collected"], 1)
+        with self.subTest("stats"):
+            # Frozen objects freed by refcounting leave the count
+            self.assertGreaterEqual(tv.gc_stats["frozen"], during[0])
+            self.assertGreaterEqual(tv.gc_stats["collections"], 1)
+        with self.subTest("restored"):
+            self.assertEqual(gc.get_freeze_count(), 0)
+            self.assertEqual(gc.get_threshold(), thresh)
+
+    @ut.skipUnless(HAS_PICKLE5, "Requires Python 3.8+")
+    @ut.skipUnless(HAS_STATM, "No /proc/self/statm")
+    def test_Good_BudgetSpill(self):
+        """Confirm largest matching values spill to disk over budget."""
+        from tempvars import TempVars
+        from tempvars.budget import MemoryBudgetExceeded, SpilledValue
+
+        tv = TempVars(starts=["t_"], export=["t_keep"], max_rss=1, ns=self.d)
+        tv._compile_patterns()
+        self.d.update(
+            {"t_big": b"x" * 2 ** 20, "t_small": [1, 2], "t_keep": 0, "y": 1}
+        )
+        dict.__setitem__(tv.stored_nsvars, "t_old", list(range(1000)))
+
+        # Spilling everything cannot bring the RSS under one byte
+        with self.assertRaises(MemoryBudgetExceeded):
+            tv._budget.check()
+
+        with self.subTest("namespace"):
+            self.assertEqual(self.d, {"t_keep": 0, "y": 1})
+        with self.subTest("spilled"):
+            self.assertEqual(
+                sorted(tv.spilled), ["t_big", "t_old", "t_small"]
+            )
+            self.assertEqual(tv.spilled["t_big"], b"x" * 2 ** 20)
+        with self.subTest("masked_lazy"):
+            self.assertIsInstance(
+                dict.__getitem__(tv.stored_nsvars, "t_old"), SpilledValue
+            )
+            self.assertEqual(tv.stored_nsvars["t_old"], list(range(1000)))
+        with self.subTest("tripped"):
+            self.assertTrue(tv._budget.tripped)
+
+    @ut.skipUnless(HAS_PICKLE5, "Requires Python 3.8+")
+    @ut.skipUnless(HAS_STATM, "No /proc/self/statm")
+    def test_Good_BudgetSpillRebound(self):
+        """Confirm a value rebound while being spilled is left in place."""
+        from tempvars import TempVars
+        from tempvars.budget import MemoryBudgetExceeded, SpillStore
+
+        tv = TempVars(starts=["t_"], max_rss=1, ns=self.d)
+        tv._compile_patterns()
+        self.d["t_big"] = b"x" * 2 ** 20
+        fresh = [1, 2, 3]
+        ns = self.d
+
+        class Rebinding(SpillStore):
+            def spill(self, name, value):
+                ok = SpillStore.spill(self, name, value)
+                # As if the suite rebound the name meanwhile
+                ns[name] = fresh
+                return ok
+
+        tv._budget.spilled = Rebinding()
+
+        with self.assertRaises(MemoryBudgetExceeded):
+            tv._budget.check()
+
+        with self.subTest("kept"):
+            self.assertIs(self.d["t_big"], fresh)
+        with self.subTest("not_recorded"):
+            self.assertNotIn("t_big", tv._budget.spilled)
+
+    @ut.skipUnless(HAS_STATM, "No /proc/self/statm")
+    def test_Good_BudgetRaise(self):
+        """Confirm the monitor raises in the suite's thread over budget."""
+        import time
+
+        from tempvars import TempVars
+        from tempvars.budget import MemoryBudgetExceeded
+
+        self.d["t_x"] = 1
+
+        with self.assertRaises(MemoryBudgetExceeded) as cm:
+            with TempVars(
+                starts=["t_"], max_rss=1, rss_action="raise", ns=self.d
+            ):
+                deadline = time.time() + 5
+                while time.time() < deadline:
+                    time.sleep(0.01)
+
+        with self.subTest("restored"):
+            self.assertEqual(self.d, {"t_x": 1})
+        with self.subTest("message"):
+            self.assertIn("exceeds the TempVars budget", str(cm.exception))
+
+    def test_Good_BudgetExitRaiseScrubs(self):
+        """Confirm a raise during the memo store still scrubs on exit."""
+        from tempvars import TempVars
+        from tempvars.budget import MemoryBudgetExceeded
+        from tempvars.memo import default_cache
+
+        default_cache().clear()
+
+        class Interrupted(TempVars):
+            def _memo_store(self):
+                raise MemoryBudgetExceeded("late")
+
+        self.d.update({"t_x": 1, "data": 2})
+        tv = Interrupted(
+            starts=["t_"], inputs=["data"], export=["out"], ns=self.d
+        )
+
+        with self.assertRaises(MemoryBudgetExceeded):
+            with tv:
+                self.d["t_y"] = 3
+                self.d["out"] = 4
+
+        with self.subTest("restored"):
+            self.assertEqual(self.d, {"t_x": 1, "data": 2, "out": 4})
+        with self.subTest("inactive"):
+            self.assertFalse(tv._active)
+
+    def test_Good_BudgetStopCancels(self):
+        """Confirm stopping the monitor cancels an undelivered raise."""
+        import threading
+
+        from tempvars.budget import BudgetGuard
+
+        guard = BudgetGuard(None, 1, action="raise")
+        gate = threading.Lock()
+        gate.acquire()
+        got = []
+
+        def target():
+            try:
+                # Blocked in C, so nothing is delivered until released
+                gate.acquire()
+                got.append("ran")
+            except BaseException as e:
+                got.append(e)
+
+        t = threading.Thread(target=target)
+        t.start()
+
+        guard._target = t.ident
+        guard._raise(2)
+        guard.stop()
+        gate.release()
+        t.join()
+
+        with self.subTest("cancelled"):
+            self.assertEqual(got, ["ran"])
+        with self.subTest("error_kept"):
+            self.assertIn("budget of 1 bytes", str(guard.error))
+
+    def test_Good_ValuePredicates(self):
+        """Confirm masking by value type and estimated size."""
+        from array import array
+
+        from tempvars import TempVars
+
+        big = array("d", bytes(80000))
+        self.d.update(
+            {
+                "arr_big": big,
+                "arr_small": array("d", [1.0]),
+                "blob": b"x" * 50000,
+                "n": 1,
+                "__big__": b"x" * 50000,
+            }
+        )
+
+        with self.subTest("types_and_size"):
+            with TempVars(types=[array], min_size=10000, ns=self.d) as tv:
+                self.assertEqual(list(tv.stored_nsvars), ["arr_big"])
+                self.d["fresh"] = array("b", bytes(20000))
+            self.assertNotIn("fresh", self.d)
+            self.assertIn("fresh", tv.retained_tempvars)
+            self.assertIs(self.d["arr_big"], big)
+
+        with self.subTest("types_only"):
+            with TempVars(types=[array], ns=self.d) as tv:
+                pass
+            self.assertEqual(
+                sorted(tv.stored_nsvars), ["arr_big", "arr_small"]
+            )
+
+        with self.subTest("size_only"):
+            with TempVars(min_size=40000, ns=self.d) as tv:
+                pass
+            self.assertEqual(sorted(tv.stored_nsvars), ["arr_big", "blob"])
+
+        with self.subTest("alongside_names"):
+            with TempVars(names=["n"], types=[bytes], ns=self.d) as tv:
+                pass
+            self.assertEqual(sorted(tv.stored_nsvars), ["blob", "n"])
+
+    def test_Good_ValuePredicatesSkipIPython(self):
+        """Confirm value criteria leave IPython's history variables be."""
+        from tempvars import TempVars
+
+        hist = {
+            "In": ["", "x = [1]"],
+            "Out": {1: [1]},
+            "_": [1],
+            "__": {},
+            "___": [],
+            "_1": [1],
+            "_i1": "x = [1]",
+            "_ih": ["", "x = [1]"],
+            "_oh": {1: [1]},
+            "_dh": ["/tmp"],
+        }
+        self.d.update(hist)
+        self.d["t_list"] = [2]
+
+        with TempVars(types=[list, dict, str], ns=self.d) as tv:
+            pass
+
+        with self.subTest("masked"):
+            self.assertEqual(list(tv.stored_nsvars), ["t_list"])
+        with self.subTest("by_name"):
+            with TempVars(names=["Out"], ns=self.d) as tv:
+                self.assertNotIn("Out", self.d)
+
+    def test_Good_RegexGlob(self):
+        """Confirm regex and glob criteria match names in full."""
+        from tempvars import TempVars
+
+        self.d.update(
+            {
+                "df_2024q1": 1,
+                "df_2024q1_final": 2,
+                "run7_out": 3,
+                "Run7_out": 4,
+                "keep": 5,
+                "__run__": 6,
+            }
+        )
+
+        with TempVars(
+            regex=[r"df_\d{4}q\d"], glob=["run?_*", "_*_"], ns=self.d
+        ) as tv:
+            pass
+
+        with self.subTest("matched"):
+            self.assertEqual(
+                sorted(tv.stored_nsvars), ["df_2024q1", "run7_out"]
+            )
+        with self.subTest("explain"):
+            report = tv.explain()
+            self.assertEqual(
+                report["regex"]["patterns"][r"df_\d{4}q\d"]["enter"], 1
+            )
+            self.assertEqual(report["glob"]["patterns"]["run?_*"]["enter"], 1)
+            self.assertEqual(report["glob"]["patterns"]["_*_"]["enter"], 0)
+
+    def test_Good_RegexMergedAndCached(self):
+        """Confirm all regex/glob patterns share one cached compiled regex."""
+        from tempvars.automaton import merged_regex
+
+        rx = merged_regex(("a+", "b\\d"), ("c*",))
+
+        with self.subTest("cached"):
+            self.assertIs(rx, merged_regex(("a+", "b\\d"), ("c*",)))
+        with self.subTest("matches"):
+            self.assertEqual(
+                [bool(rx.fullmatch(k)) for k in ["aaa", "b1", "cx", "ab"]],
+                [True, True, True, False],
+            )
+
+    def test_Good_Census(self):
+        """Confirm census sizes, spec coverage and identity caching."""
+        from tempvars import TempVars
+        from tempvars.census import Census, estimate
+
+        self.d.update(
+            {
+                "t_big": [b"x" * 1000] * 100,
+                "data": b"y" * 50000,
+                "small": 1,
+                "__doc__": "z" * 100000,
+            }
+        )
+        census = Census(TempVars(starts=["t_"], ns=self.d), top=2)
+        res = census.sample()
+
+        with self.subTest("largest"):
+            self.assertEqual(
+                [(n, c) for n, _, c in res["largest"]],
+                [("t_big", True), ("data", False)],
+            )
+        with self.subTest("one_level_estimate"):
+            self.assertEqual(res["largest"][0][1], estimate(self.d["t_big"]))
+            self.assertGreater(res["largest"][0][1], 100000)
+        with self.subTest("totals"):
+            self.assertEqual(res["caught_bytes"], res["largest"][0][1])
+            self.assertGreater(res["uncaught_bytes"], 50000)
+        with self.subTest("cache_reused"):
+            entry = census._cache[id(self.d["data"])]
+            census.sample()
+            self.assertIs(census._cache[id(self.d["data"])], entry)
+        with self.subTest("cache_invalidated"):
+            self.d["t_big"].append(b"")
+            census.sample()
+            self.assertEqual(
+                census._cache[id(self.d["t_big"])][2], len(self.d["t_big"])
+            )
+        with self.subTest("cache_pruned"):
+            old = id(self.d.pop("data"))
+            census.sample()
+            self.assertNotIn(old, census._cache)
+
+    def test_Good_CensusConcurrentMutation(self):
+        """Confirm mutation mid-sample neither errors nor kills the thread."""
+        import time
+
+        from tempvars import TempVars
+        from tempvars.census import Census, estimate
+        from tempvars.sizing import approx_size
+
+        class Mutating(list):
+            def __iter__(self):
+                raise RuntimeError("list changed size during iteration")
+
+        class Flaky(object):
+            fails = [1]
+
+            @property
+            def nbytes(self):
+                if self.fails:
+                    self.fails.pop()
+                    raise RuntimeError("mutated")
+                return 10
+
+        with self.subTest("estimate"):
+            obj = Mutating([1, 2, 3])
+            self.assertEqual(estimate(obj), approx_size(obj))
+
+        self.d["t_x"] = Flaky()
+        census = Census(TempVars(starts=["t_"], ns=self.d))
+        census.start(interval=0.01)
+        try:
+            deadline = time.time() + 5
+            while census.last is None and time.time() < deadline:
+                time.sleep(0.01)
+
+            with self.subTest("thread_survives"):
+                self.assertTrue(census._thread.is_alive())
+        finally:
+            census.stop()
+
+        with self.subTest("sampled"):
+            self.assertEqual(census.last["caught_bytes"], 10)
+
+    def test_Good_Drain(self):
+        """Confirm drain() empties the instance one value at a time."""
+        import weakref
+
+        from tempvars import TempVars
+
+        class Thing(object):
+            pass
+
+        self.d.update({"t_x": Thing(), "y": 1})
+
+        with TempVars(starts=["t_"], restore=False, ns=self.d) as tv:
+            self.d["t_a"] = Thing()
+            self.d["t_b"] = Thing()
+
+        refs = {k: weakref.ref(v) for k, v in tv.retained_tempvars.items()}
+        refs["t_x"] = weakref.ref(tv.stored_nsvars["t_x"])
+        seen = []
+
+        for name, val in tv.drain(stored=True):
+            seen.append(name)
+            with self.subTest("removed_" + name):
+                self.assertNotIn(name, tv.retained_tempvars)
+                self.assertNotIn(name, tv.stored_nsvars)
+            with self.subTest("previous_freed_" + name):
+                if len(seen) > 1:
+                    self.assertIsNone(refs[seen[-2]]())
+            del val
+
+        with self.subTest("order"):
+            self.assertEqual(seen, ["t_a", "t_b", "t_x"])
+        with self.subTest("emptied"):
+            self.assertEqual(tv.retained_tempvars, {})
+            self.assertEqual(tv.stored_nsvars, {})
+
 
 class TestTempVarsExpectFail(SuperTestTempVars, ut.TestCase):
     """Testing that code raises expected errors when invoked improperly."""
 
-    list_args = ["names", "starts", "ends"]
+    list_args = [
+        "names",
+        "starts",
+        "ends",
+        "contains",
+        "regex",
+        "glob",
+        "export",
+        "inputs",
+    ]
 
     def test_Fail_ArgIsNotListOrNone(self):
         """Confirm `TypeError` if non-list passed to var arg."""
@@ -671,7 +2164,7 @@ class TestTempVarsExpectFail(SuperTestTempVars, ut.TestCase):
             'TempVars({0}=["abc", "{1}", "pqr"])'
         )
 
-        for arg in ["starts", "ends"]:
+        for arg in ["starts", "ends", "contains", "regex", "glob"]:
             for val in ["_", "__"]:
                 with self.subTest("{0}-{1}".format(arg, val)):
                     self.assertRaises(
@@ -686,6 +2179,26 @@ class TestTempVarsExpectFail(SuperTestTempVars, ut.TestCase):
         with self.subTest("ends-any-dunder-end"):
             self.assertRaises(ValueError, exec, code.format("ends", "s__"), {})
 
+    def test_Fail_NonBooleanFlags(self):
+        """Confirm `TypeError` if non-boolean flags are passed."""
+        code = (
+            "from tempvars import TempVars; "
+            'TempVars(names=["abc"], {0}=1)'
+        )
+
+        for arg in [
+            "auto",
+            "retain",
+            "track_leaks",
+            "purge_outputs",
+            "share",
+            "rollback",
+            "release_async",
+            "gc_freeze",
+        ]:
+            with self.subTest(arg):
+                self.assertRaises(TypeError, exec, code.format(arg), {})
+
     def test_Fail_NonBooleanRestore(self):
         """Confirm `TypeError` if non-boolean `restore` is passed."""
         code = (
@@ -703,6 +2216,175 @@ class TestTempVarsExpectFail(SuperTestTempVars, ut.TestCase):
             with TempVars(names=["abcd"]):
                 pass  # pragma: no cover
 
+    def test_Fail_NonDictNamespace(self):
+        """Confirm `TypeError` if a non-dict is passed as `ns`."""
+        from tempvars import TempVars
+
+        self.assertRaises(TypeError, TempVars, names=["abc"], ns=[])
+
+    def test_Fail_LazyValueAbstract(self):
+        """Confirm a stand-in without `inflate` cannot be constructed."""
+        from tempvars.compression import LazyValue
+
+        class Incomplete(LazyValue):
+            __slots__ = ()
+
+        self.assertRaises(TypeError, Incomplete)
+
+    def test_Fail_BadCompressArgs(self):
+        """Confirm errors on invalid compression arguments."""
+        from tempvars import TempVars
+
+        with self.subTest("method"):
+            self.assertRaises(
+                ValueError, TempVars, names=["abc"], compress="gzip", ns={}
+            )
+        with self.subTest("threshold"):
+            self.assertRaises(
+                TypeError,
+                TempVars,
+                names=["abc"],
+                compress="zlib",
+                compress_threshold=1.5,
+                ns={},
+            )
+
+    def test_Fail_BadRegex(self):
+        """Confirm `ValueError` on invalid or clashing regex patterns."""
+        from tempvars import TempVars
+
+        with self.subTest("invalid"):
+            self.assertRaises(ValueError, TempVars, regex=["a("], ns={})
+        with self.subTest("clashing_groups"):
+            self.assertRaises(
+                ValueError,
+                TempVars,
+                regex=["(?P<x>a)", "(?P<x>b)"],
+                ns={},
+            )
+        for pat in [r"(a)\1", r"(a)?(?(1)b|c)"]:
+            with self.subTest("numbered_ref", pat=pat):
+                self.assertRaises(
+                    ValueError, TempVars, regex=["(x)y", pat], ns={}
+                )
+        with self.subTest("named_ref_ok"):
+            tv = TempVars(regex=["(x)y", r"(?P<a>a)(?P=a)"], ns={})
+            tv._compile_patterns()
+            self.assertTrue(tv._is_temp("aa"))
+
+    def test_Fail_BadValueCriteria(self):
+        """Confirm `TypeError` on invalid `types`/`min_size` arguments."""
+        from tempvars import TempVars
+
+        for kwargs in [
+            {"types": int},
+            {"types": [int, "str"]},
+            {"min_size": 1.5},
+        ]:
+            with self.subTest(repr(kwargs)):
+                self.assertRaises(TypeError, TempVars, ns={}, **kwargs)
+
+    @ut.skipUnless(HAS_PICKLE5, "Requires Python 3.8+")
+    def test_Fail_BadPersistArgs(self):
+        """Confirm `ValueError` on a missing or invalid persistence label."""
+        from tempvars import TempVars
+
+        for label in [None, "", ".hidden", "a/b"]:
+            with self.subTest(repr(label)):
+                self.assertRaises(
+                    ValueError,
+                    TempVars,
+                    names=["abc"],
+                    persist="store",
+                    label=label,
+                    ns={},
+                )
+
+    def test_Fail_BadGCArgs(self):
+        """Confirm errors on invalid GC-control arguments."""
+        from tempvars import TempVars
+
+        with self.subTest("threshold_without_freeze"):
+            self.assertRaises(
+                ValueError, TempVars, names=["abc"], gc_threshold=(1,), ns={}
+            )
+        with self.subTest("threshold_type"):
+            self.assertRaises(
+                TypeError,
+                TempVars,
+                names=["abc"],
+                gc_freeze=True,
+                gc_threshold=[1000],
+                ns={},
+            )
+
+    def test_Fail_BadBudgetArgs(self):
+        """Confirm errors on invalid memory-budget arguments."""
+        from tempvars import TempVars
+
+        with self.subTest("max_rss"):
+            self.assertRaises(
+                TypeError, TempVars, names=["abc"], max_rss=1.5, ns={}
+            )
+        with self.subTest("rss_action"):
+            self.assertRaises(
+                ValueError,
+                TempVars,
+                names=["abc"],
+                max_rss=2 ** 40,
+                rss_action="swap",
+                ns={},
+            )
+        with self.subTest("spill_needs_protocol_5"):
+            import pickle
+
+            from tempvars.budget import SpillStore
+
+            saved = pickle.HIGHEST_PROTOCOL
+            pickle.HIGHEST_PROTOCOL = 4
+            try:
+                self.assertRaises(RuntimeError, SpillStore)
+            finally:
+                pickle.HIGHEST_PROTOCOL = saved
+        with self.subTest("raise_spills_nothing"):
+            tv = TempVars(
+                names=["abc"], max_rss=2 ** 40, rss_action="raise", ns={}
+            )
+            self.assertIsNone(tv.spilled)
+        with self.subTest("rss_action_unused"):
+            self.assertRaises(
+                ValueError, TempVars, names=["abc"], rss_action="swap", ns={}
+            )
+
+    @ut.skipIf(HAS_SUBINTERPRETERS, "Subinterpreters available")
+    def test_Fail_IsolatedUnsupported(self):
+        """Confirm `RuntimeError` starting an isolated suite if unsupported."""
+        from tempvars import TempVars
+        from tempvars.isolated import IsolatedSuite
+
+        suite = IsolatedSuite(TempVars(names=["abc"], ns={}), "pass")
+        self.assertRaises(RuntimeError, suite.start)
+
+    @ut.skipIf(HAS_LOCALS_PROXY, "PEP 667 frame locals available")
+    def test_Fail_LocalScopeUnsupported(self):
+        """Confirm `RuntimeError` for `local=True` before Python 3.13."""
+        from tempvars import TempVars
+
+        with self.assertRaises(RuntimeError):
+            TempVars(names=["abc"], local=True)
+
+    def test_Fail_NestedReentry(self):
+        """Confirm `RuntimeError` if an active instance is re-entered."""
+        code = (
+            "from tempvars import TempVars\n"
+            "tv = TempVars(names=['abc'])\n"
+            "with tv:\n"
+            "    with tv:\n"
+            "        pass\n"
+        )
+
+        self.assertRaises(RuntimeError, exec, code, self.d)
+
     def test_Fail_NoPatternArgsWarning(self):
         """Confirm `RuntimeWarning` if no pattern arguments are passed."""
         code = (
@@ -719,7 +2401,7 @@ class TestTempVarsExpectFail(SuperTestTempVars, ut.TestCase):
             "with TempVars(**{{'{0}': []}}):\n"
             "    pass\n"
         )
-        for _ in ["names", "starts", "ends"]:
+        for _ in ["names", "starts", "ends", "contains"]:
             self.d = {}
             with self.subTest(_):
                 with self.assertWarns(RuntimeWarning):